@@ -0,0 +1,333 @@
+import http.client
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from rest_framework.throttling import AnonRateThrottle
+
+from landing.pricing import clear_pricing_caches, stripe_breaker
+from landing.stripe_standin import StripeStandin, load_catalog, synthetic_prices
+
+ENDPOINTS = {
+    'index': ('GET', '/', None),
+    'pricing': ('GET', '/api/pricing/', None),
+    'health': ('GET', '/api/health/', None),
+    'contact': ('POST', '/api/contact/', {
+        'name': 'Bench Mark', 'email': 'bench@example.com', 'company': 'HubSign',
+        'message': 'Load test submission.',
+    }),
+    'newsletter': ('POST', '/api/newsletter/', {'email': 'bench@example.com'}),
+}
+
+SCENARIOS = ('billing-off', 'billing-on')
+MODES = ('inprocess', 'socket')
+
+# Throttling stays on (it's part of the request cost) but can't be allowed to
+# turn the run into a 429 benchmark.
+BENCH_THROTTLE_RATE = '1000000/second'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the public endpoints in-process (Django test client) and over a '
+        'real gunicorn socket, with billing off and on (against the local Stripe '
+        'stand-in, with injected latency). Reports p50/p95/p99 latency, throughput '
+        'and, in-process, peak allocation per request; --output saves the results '
+        'as JSON and --baseline compares against a previous run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+        parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+        parser.add_argument('--requests', type=int, default=500, help='Timed requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--alloc-requests', type=int, default=100,
+                            help='Requests per endpoint traced for allocations (in-process only).')
+        parser.add_argument('--concurrency', type=int, default=8, help='Client threads in socket mode.')
+        parser.add_argument('--workers', type=int, default=4, help='gunicorn workers in socket mode.')
+        parser.add_argument('--stripe-latency', type=float, default=250.0,
+                            help='Stand-in Stripe delay per response, ms.')
+        parser.add_argument('--stripe-jitter', type=float, default=100.0)
+        parser.add_argument('--stripe-catalog-size', type=int, default=1000)
+        parser.add_argument('--pricing-ttl', type=int, default=None,
+                            help='Override PRICING_CACHE_TTL/PRICING_SHARED_CACHE_TTL (seconds) to '
+                                 'make Stripe refreshes happen during the run.')
+        parser.add_argument('--output', help='Write results to this JSON file.')
+        parser.add_argument('--baseline', help='Compare against a previous --output file.')
+
+    def handle(self, *args, **options):
+        prices = load_catalog()
+        prices = synthetic_prices(max(options['stripe_catalog_size'] - len(prices), 0)) + prices
+        standin = StripeStandin(
+            prices,
+            latency=options['stripe_latency'] / 1000,
+            jitter=options['stripe_jitter'] / 1000,
+        )
+        api_base = standin.start()
+
+        results = []
+        try:
+            for scenario in options['scenarios']:
+                for mode in options['modes']:
+                    run = self.run_inprocess if mode == 'inprocess' else self.run_socket
+                    for row in run(scenario, api_base, options):
+                        row.update(mode=mode, scenario=scenario)
+                        results.append(row)
+                        self.report(row)
+        finally:
+            standin.stop()
+
+        report = {'meta': self.meta(options, standin), 'results': results}
+        if options['baseline']:
+            self.compare(results, options['baseline'])
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS('Results written to {}'.format(options['output'])))
+
+    # In-process -----------------------------------------------------------
+
+    def run_inprocess(self, scenario, api_base, options):
+        with ExitStack() as stack:
+            stack.enter_context(override_settings(**self.scenario_settings(scenario, api_base, options)))
+            stack.enter_context(patch.dict(AnonRateThrottle.THROTTLE_RATES, anon=BENCH_THROTTLE_RATE))
+            clear_pricing_caches()
+            stripe_breaker.reset()
+
+            # Outside the test runner: a real host, and HTTPS so SECURE_SSL_REDIRECT
+            # doesn't turn every request into a 301.
+            client = Client(HTTP_HOST='localhost')
+            rows = []
+            for name in options['endpoints']:
+                method, path, body = ENDPOINTS[name]
+
+                def request():
+                    if method == 'GET':
+                        response = client.get(path, secure=True)
+                    else:
+                        response = client.post(
+                            path, data=body, content_type='application/json', secure=True,
+                        )
+                    if response.status_code >= 400:
+                        raise CommandError('{} {} returned {}'.format(method, path, response.status_code))
+
+                for _ in range(options['warmup']):
+                    request()
+
+                samples = []
+                started = time.perf_counter()
+                for _ in range(options['requests']):
+                    start = time.perf_counter()
+                    request()
+                    samples.append(time.perf_counter() - start)
+                elapsed = time.perf_counter() - started
+
+                row = self.summarize(name, samples, elapsed)
+                row['alloc_peak_kib'] = self.allocations(request, options['alloc_requests'])
+                rows.append(row)
+            return rows
+
+    @staticmethod
+    def allocations(request, count):
+        """Mean peak of memory allocated while serving one request, in KiB."""
+        if count <= 0:
+            return None
+        tracemalloc.start()
+        try:
+            peaks = []
+            for _ in range(count):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                request()
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        finally:
+            tracemalloc.stop()
+        return round(statistics.fmean(peaks) / 1024, 1)
+
+    # Over a gunicorn socket -------------------------------------------------
+
+    def run_socket(self, scenario, api_base, options):
+        port = self.free_port()
+        env = dict(os.environ, **self.scenario_environ(scenario, api_base, options))
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env['DJANGO_CACHE_DIR'] = cache_dir
+            server = subprocess.Popen(
+                [
+                    sys.executable, '-m', 'gunicorn',
+                    '--bind', '127.0.0.1:{}'.format(port),
+                    '--workers', str(options['workers']),
+                    '--log-level', 'warning',
+                    'hubsign.wsgi:application',
+                ],
+                cwd=settings.BASE_DIR, env=env,
+            )
+            try:
+                self.wait_for(port, server)
+                return [self.drive_socket(name, port, options) for name in options['endpoints']]
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def drive_socket(self, name, port, options):
+        method, path, body = ENDPOINTS[name]
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {
+            # As nginx sends it; otherwise SECURE_SSL_REDIRECT answers every request with a 301.
+            'X-Forwarded-Proto': 'https',
+            'Host': '127.0.0.1',
+        }
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+
+        def request():
+            # gunicorn's sync workers close the connection after each response.
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+            finally:
+                conn.close()
+            if response.status >= 400:
+                raise CommandError('{} {} returned {}'.format(method, path, response.status))
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            list(pool.map(lambda _: request(), range(options['warmup'])))
+            started = time.perf_counter()
+            samples = list(pool.map(lambda _: request(), range(options['requests'])))
+            elapsed = time.perf_counter() - started
+
+        row = self.summarize(name, samples, elapsed)
+        row['alloc_peak_kib'] = None
+        return row
+
+    @staticmethod
+    def free_port():
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            return s.getsockname()[1]
+
+    @staticmethod
+    def wait_for(port, server, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError('gunicorn exited with {}'.format(server.returncode))
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                return
+            except OSError:
+                time.sleep(0.1)
+        raise CommandError('gunicorn did not start listening on port {}'.format(port))
+
+    # Scenarios, summaries, output -----------------------------------------
+
+    @staticmethod
+    def scenario_settings(scenario, api_base, options):
+        overrides = {'BILLING_ENABLED': False}
+        if scenario == 'billing-on':
+            overrides = {'BILLING_ENABLED': True, 'STRIPE_API_KEY': 'sk_bench', 'STRIPE_API_BASE': api_base}
+            if options['pricing_ttl'] is not None:
+                overrides.update(
+                    PRICING_CACHE_TTL=options['pricing_ttl'],
+                    PRICING_SHARED_CACHE_TTL=options['pricing_ttl'],
+                )
+        return overrides
+
+    @staticmethod
+    def scenario_environ(scenario, api_base, options):
+        environ = {
+            'API_ANON_THROTTLE_RATE': BENCH_THROTTLE_RATE,
+            'NEXT_PUBLIC_FEATURE_BILLING_ENABLED': 'false',
+        }
+        if scenario == 'billing-on':
+            environ.update({
+                'NEXT_PUBLIC_FEATURE_BILLING_ENABLED': 'true',
+                'NEXT_PRIVATE_STRIPE_API_KEY': 'sk_bench',
+                'STRIPE_API_BASE': api_base,
+            })
+            if options['pricing_ttl'] is not None:
+                environ['PRICING_CACHE_TTL'] = str(options['pricing_ttl'])
+                environ['PRICING_SHARED_CACHE_TTL'] = str(options['pricing_ttl'])
+        return environ
+
+    @staticmethod
+    def summarize(name, samples, elapsed):
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+        return {
+            'endpoint': name,
+            'requests': len(samples),
+            'p50_ms': round(cuts[49] * 1000, 3),
+            'p95_ms': round(cuts[94] * 1000, 3),
+            'p99_ms': round(cuts[98] * 1000, 3),
+            'max_ms': round(max(samples) * 1000, 3),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+        }
+
+    def report(self, row):
+        self.stdout.write(
+            '{mode:<10} {scenario:<12} {endpoint:<11} p50 {p50_ms:>8.2f}  p95 {p95_ms:>8.2f}  '
+            'p99 {p99_ms:>8.2f}  max {max_ms:>8.2f} ms  {throughput_rps:>8.1f} req/s  '
+            'alloc {alloc}'.format(
+                alloc='-' if row['alloc_peak_kib'] is None else '{} KiB'.format(row['alloc_peak_kib']),
+                **row,
+            )
+        )
+
+    def compare(self, results, path):
+        with open(path) as f:
+            baseline = {
+                (r['mode'], r['scenario'], r['endpoint']): r for r in json.load(f)['results']
+            }
+        self.stdout.write('\nChange vs {}:'.format(path))
+        for row in results:
+            before = baseline.get((row['mode'], row['scenario'], row['endpoint']))
+            if not before:
+                continue
+            self.stdout.write('{:<10} {:<12} {:<11} p50 {:>+7.1%}  p99 {:>+7.1%}  req/s {:>+7.1%}'.format(
+                row['mode'], row['scenario'], row['endpoint'],
+                row['p50_ms'] / before['p50_ms'] - 1,
+                row['p99_ms'] / before['p99_ms'] - 1,
+                row['throughput_rps'] / before['throughput_rps'] - 1,
+            ))
+
+    @staticmethod
+    def meta(options, standin):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'cpu_count': os.cpu_count(),
+            'stripe_requests': standin.requests,
+            'options': {k: v for k, v in options.items() if k in {
+                'modes', 'scenarios', 'endpoints', 'requests', 'warmup', 'alloc_requests',
+                'concurrency', 'workers', 'stripe_latency', 'stripe_jitter',
+                'stripe_catalog_size', 'pricing_ttl',
+            }},
+        }
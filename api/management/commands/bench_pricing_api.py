@@ -0,0 +1,84 @@
+import asyncio
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.views import PricingInfoView
+from landing.pricing import get_pricing_snapshot, tiers_as_dicts
+
+
+class DRFPricingInfoView(APIView):
+    """PricingInfoView as it was before bodies were pre-rendered: the tiers go
+    through dataclasses.asdict and DRF's negotiation/renderer on every request.
+    Throttling is left off so it doesn't skew the comparison."""
+    permission_classes = [AllowAny]
+    throttle_classes = []
+
+    def get(self, request):
+        pricing = get_pricing_snapshot()
+        return Response({'tiers': tiers_as_dicts(pricing.tiers), 'currency': 'USD'})
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark GET /api/pricing/ view latency: the DRF-rendered response vs '
+        'the pre-rendered bytes PricingInfoView serves now.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        views = [
+            ('drf (before)', DRFPricingInfoView.as_view()),
+            ('pre-rendered', PricingInfoView.as_view()),
+        ]
+        self.stdout.write('{:<14} {:>10} {:>10} {:>10}'.format('view', 'mean us', 'p50 us', 'p99 us'))
+        for label, view in views:
+            samples = self.run(factory, view, options['requests'])
+            self.stdout.write('{:<14} {:>10.1f} {:>10.1f} {:>10.1f}'.format(
+                label,
+                statistics.fmean(samples),
+                statistics.median(samples),
+                statistics.quantiles(samples, n=100)[98],
+            ))
+
+    def run(self, factory, view, count):
+        if asyncio.iscoroutinefunction(view):
+            return asyncio.run(self.arun(factory, view, count))
+        for _ in range(min(200, count)):
+            response = view(factory.get('/api/pricing/'))
+            if hasattr(response, 'render'):
+                response.render()
+
+        samples = []
+        for _ in range(count):
+            request = factory.get('/api/pricing/')
+            start = time.perf_counter()
+            response = view(request)
+            if hasattr(response, 'render'):
+                response.render()
+            samples.append((time.perf_counter() - start) * 1e6)
+            assert response.status_code == 200
+        return samples
+
+    @staticmethod
+    async def arun(factory, view, count):
+        """run() for async views, awaited on one event loop as ASGI would."""
+        for _ in range(min(200, count)):
+            await view(factory.get('/api/pricing/'))
+
+        samples = []
+        for _ in range(count):
+            request = factory.get('/api/pricing/')
+            start = time.perf_counter()
+            response = await view(request)
+            samples.append((time.perf_counter() - start) * 1e6)
+            assert response.status_code == 200
+        return samples
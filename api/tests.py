@@ -1,4 +1,31 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from landing.pricing import PricingSnapshot, _fallback_snapshot
+
+from .views import StripeWebhookView
+
+STRIPE_FIXTURES = Path(__file__).resolve().parent / 'fixtures' / 'stripe'
+WEBHOOK_SECRET = 'whsec_test_secret'
+
+
+def recorded_event(name):
+    return (STRIPE_FIXTURES / '{}.json'.format(name)).read_bytes()
+
+
+def stripe_signature(payload, secret=WEBHOOK_SECRET, timestamp=None):
+    timestamp = timestamp or int(time.time())
+    signed = '{}.{}'.format(timestamp, payload.decode()).encode()
+    digest = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return 't={},v1={}'.format(timestamp, digest)
 
 
 class PricingApiTests(TestCase):
@@ -18,6 +45,35 @@ class PricingApiTests(TestCase):
         self.assertEqual([a['id'] for a in business['addons']], ['doc_block'])
         self.assertEqual(business['addons'][0]['price_monthly'], 45)
 
+    def test_etag_revalidation_returns_304_without_body(self):
+        response = self.client.get('/api/pricing/')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+        with patch('api.views.pricing_payload') as mock_serialize:
+            revalidated = self.client.get('/api/pricing/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+        self.assertEqual(revalidated['ETag'], etag)
+        mock_serialize.assert_not_called()
+
+    def test_body_is_rendered_once_per_pricing_version(self):
+        first = self.client.get('/api/pricing/')
+
+        with patch('api.views.pricing_payload') as mock_serialize:
+            second = self.client.get('/api/pricing/')
+
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(second.content, first.content)
+        mock_serialize.assert_not_called()
+
+    def test_stale_etag_gets_full_response(self):
+        response = self.client.get('/api/pricing/', HTTP_IF_NONE_MATCH='"not-the-current-version"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['tiers']), 5)
+
     def test_api_and_ssr_agree_on_business_price(self):
         """Both IndexView and PricingInfoView now read from the same shared
         landing.pricing.get_pricing_tiers() -- this is the direct regression
@@ -27,3 +83,163 @@ class PricingApiTests(TestCase):
 
         ssr_response = self.client.get('/')
         self.assertContains(ssr_response, '${}'.format(api_business['price_monthly']))
+
+    def test_currency_is_negotiated_from_query_then_cookie(self):
+        usd = _fallback_snapshot()
+        eur_tiers = [replace(t, price_monthly=t.price_monthly + 1) for t in usd.tiers]
+        snapshot = PricingSnapshot.build({'usd': usd.tiers, 'eur': eur_tiers}, usd.last_modified)
+
+        with patch('landing.pricing._fallback_snapshot', return_value=snapshot), \
+                override_settings(PRICING_MULTI_CURRENCY=True, PRICING_CURRENCIES=['usd', 'eur']):
+            default = self.client.get('/api/pricing/')
+            page = self.client.get('/', {'currency': 'eur'})
+            remembered = self.client.get('/api/pricing/')
+
+        self.assertEqual(default.json()['currency'], 'USD')
+        self.assertEqual(page.cookies['pricing_currency'].value, 'eur')
+        self.assertContains(page, '€200')
+        self.assertEqual(remembered.json()['currency'], 'EUR')
+        self.assertEqual(remembered.json()['currency_symbol'], '€')
+        self.assertEqual(remembered.json()['tiers'][3]['price_monthly'], 200)
+        self.assertNotEqual(remembered['ETag'], default['ETag'])
+        self.assertIn('Cookie', remembered['Vary'])
+
+    async def test_pricing_pages_are_served_asynchronously(self):
+        api_response = await self.async_client.get('/api/pricing/')
+        ssr_response = await self.async_client.get('/')
+
+        self.assertEqual(api_response.status_code, 200)
+        self.assertEqual(ssr_response.status_code, 200)
+        self.assertContains(ssr_response, 'data-tier="business"')
+
+
+@override_settings(
+    STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET, STRIPE_WEBHOOK_RECHECK_DELAY=0,
+    BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake',
+)
+class StripeWebhookTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post_event(self, payload, signature=None):
+        return self.client.post(
+            '/api/stripe/webhook/', data=payload, content_type='application/json',
+            HTTP_STRIPE_SIGNATURE=signature or stripe_signature(payload),
+        )
+
+    @patch('api.views.refresh_pricing')
+    def test_price_and_product_events_rebuild_pricing(self, mock_refresh):
+        for name in ('price.updated', 'product.updated'):
+            response = self.post_event(recorded_event(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {'received': True})
+        self.assertEqual(mock_refresh.call_count, 2)
+
+    @patch('api.views.refresh_pricing')
+    def test_other_events_are_acknowledged_without_rebuild(self, mock_refresh):
+        response = self.post_event(recorded_event('customer.created'))
+        self.assertEqual(response.status_code, 200)
+        mock_refresh.assert_not_called()
+
+    @patch('api.views.refresh_pricing')
+    def test_redelivered_event_is_deduplicated(self, mock_refresh):
+        payload = recorded_event('price.updated')
+        self.post_event(payload)
+        response = self.post_event(payload)
+
+        self.assertEqual(response.json(), {'received': True, 'duplicate': True})
+        mock_refresh.assert_called_once()
+
+    @patch('api.views.refresh_pricing', return_value=None)
+    def test_failed_rebuild_asks_stripe_to_redeliver(self, mock_refresh):
+        payload = recorded_event('price.updated')
+        with self.assertLogs('api.views', level='WARNING'):
+            failed = self.post_event(payload)
+        self.assertEqual(failed.status_code, 503)
+
+        mock_refresh.return_value = object()
+        redelivered = self.post_event(payload)
+
+        self.assertEqual(redelivered.json(), {'received': True})
+        self.assertEqual(mock_refresh.call_count, 2)
+
+    @override_settings(STRIPE_WEBHOOK_RECHECK_DELAY=60)
+    @patch('api.views.threading.Timer')
+    @patch('api.views.refresh_pricing')
+    def test_a_burst_of_events_schedules_one_recheck(self, mock_refresh, mock_timer):
+        for name in ('price.updated', 'product.updated'):
+            self.post_event(recorded_event(name))
+
+        self.assertEqual(mock_refresh.call_count, 2)
+        mock_timer.assert_called_once_with(60, StripeWebhookView.recheck)
+
+        StripeWebhookView.recheck()
+        payload = recorded_event('price.updated')
+        cache.delete('stripe:webhook-event:{}'.format(json.loads(payload)['id']))
+        self.post_event(payload)
+
+        self.assertEqual(mock_timer.call_count, 2)
+
+    @patch('api.views.refresh_pricing')
+    def test_bad_signature_is_rejected(self, mock_refresh):
+        payload = recorded_event('price.updated')
+        with self.assertLogs('api.views', level='WARNING'):
+            response = self.post_event(payload, signature=stripe_signature(payload, secret='whsec_wrong'))
+
+        self.assertEqual(response.status_code, 400)
+        mock_refresh.assert_not_called()
+
+    @override_settings(STRIPE_WEBHOOK_SECRET='')
+    @patch('api.views.refresh_pricing')
+    def test_unconfigured_secret_is_refused(self, mock_refresh):
+        with self.assertLogs('api.views', level='ERROR'):
+            response = self.post_event(recorded_event('price.updated'))
+
+        self.assertEqual(response.status_code, 503)
+        mock_refresh.assert_not_called()
+
+    @override_settings(BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake')
+    @patch('landing.pricing.stripe.Price.search')
+    def test_price_event_replaces_cached_snapshot(self, mock_search):
+        from landing.pricing import get_pricing_tiers
+        from landing.tests import FakeSearchResult, fake_price, reset_pricing_state
+
+        reset_pricing_state()
+        mock_search.return_value = FakeSearchResult([
+            fake_price(19900, 'month', 'price_biz_m', type='org_seat', tier='BUSINESS'),
+        ])
+        self.assertEqual(get_pricing_tiers()[3].price_monthly, 199)
+
+        mock_search.return_value = FakeSearchResult([
+            fake_price(21900, 'month', 'price_biz_m', type='org_seat', tier='BUSINESS'),
+        ])
+        self.post_event(recorded_event('price.updated'))
+
+        self.assertEqual(get_pricing_tiers()[3].price_monthly, 219)
+        self.assertEqual(mock_search.call_count, 2)
+
+
+class HealthCheckTests(TestCase):
+    def test_public_health_is_coarse(self):
+        response = self.client.get('/api/health/')
+
+        self.assertEqual(response.json(), {'status': 'healthy', 'service': 'hubsign-landing', 'pricing': 'ok'})
+
+    @override_settings(HEALTH_CHECK_TOKEN='s3cret')
+    def test_detailed_status_needs_the_token(self):
+        self.assertNotIn('pricing_status', self.client.get('/api/health/', HTTP_X_HEALTH_TOKEN='wrong').json())
+
+        detailed = self.client.get('/api/health/', HTTP_X_HEALTH_TOKEN='s3cret').json()
+
+        self.assertIn('stripe_breaker', detailed['pricing_status'])
+
+
+class BenchSummaryTests(TestCase):
+    def test_percentiles_stay_within_the_samples(self):
+        from api.management.commands.bench_endpoints import Command
+
+        samples = [0.001 * i for i in range(1, 31)]
+        summary = Command.summarize('pricing', samples, elapsed=1.0)
+
+        self.assertLessEqual(summary['p99_ms'], summary['max_ms'])
+        self.assertEqual(summary['max_ms'], 30.0)
@@ -11,4 +11,7 @@ urlpatterns = [
     # Public info endpoints
     path('pricing/', views.PricingInfoView.as_view(), name='pricing-info'),
     path('health/', views.HealthCheckView.as_view(), name='health-check'),
+
+    # Stripe
+    path('stripe/webhook/', views.StripeWebhookView.as_view(), name='stripe-webhook'),
 ]
@@ -1,10 +1,25 @@
+import json
 import logging
+import threading
+
+import stripe
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views import View
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
-from landing.pricing import get_pricing_tiers, tiers_as_dicts
+from landing.pricing import (
+    aget_pricing_snapshot, negotiate_currency, pricing_payload, pricing_refresher, refresh_pricing,
+    varies_by_currency,
+)
 
 from .serializers import (
     ContactFormSerializer,
@@ -66,30 +81,165 @@ class NewsletterSignupView(APIView):
         })
 
 
-class PricingInfoView(APIView):
+class PricingInfoView(View):
     """Get current pricing information, sourced from Stripe when billing is enabled.
 
-    Thin JSON adapter over landing.pricing.get_pricing_tiers() -- that module is
+    Thin JSON adapter over landing.pricing.get_pricing_snapshot() -- that module is
     the single source of truth for pricing, shared with the server-rendered
     landing page (landing.views.IndexView). See PRODUCTION_INCIDENT.md for why
     this used to be a second, independently-maintained copy.
+
+    A plain Django view rather than an APIView: the body only changes when the
+    pricing fingerprint does, so it is rendered to bytes once per fingerprint
+    (pricing_json_body) and served as-is, skipping DRF's authentication,
+    throttling, content negotiation and renderer on every hit. It is async so
+    that, under ASGI, a cold pricing cache waiting on Stripe doesn't tie up a
+    worker thread.
     """
+
+    async def get(self, request):
+        """Return pricing tiers as JSON, sourced from Stripe when billing is enabled.
+
+        The currency comes from ?currency= or the currency cookie (see
+        landing.pricing.negotiate_currency); each currency is its own snapshot
+        with its own fingerprint. The ETag is that fingerprint, so a matching
+        If-None-Match (or If-Modified-Since) gets a 304 before any body is
+        looked up.
+        """
+        snapshot = await aget_pricing_snapshot(negotiate_currency(request))
+        etag = quote_etag(snapshot.fingerprint)
+        last_modified = int(snapshot.last_modified)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(pricing_json_body(snapshot), content_type='application/json')
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        if varies_by_currency():
+            patch_vary_headers(response, ('Cookie',))
+        return response
+
+
+_PRICING_BODIES = {}
+_PRICING_BODIES_MAX = 8
+
+
+def pricing_json_body(snapshot) -> bytes:
+    """The /api/pricing/ response body for a PricingSnapshot, rendered once."""
+    body = _PRICING_BODIES.get(snapshot.fingerprint)
+    if body is None:
+        body = json.dumps(
+            pricing_payload(snapshot), ensure_ascii=False, separators=(',', ':'),
+        ).encode('utf-8')
+        if len(_PRICING_BODIES) >= _PRICING_BODIES_MAX:
+            _PRICING_BODIES.clear()
+        _PRICING_BODIES[snapshot.fingerprint] = body
+    return body
+
+
+class StripeWebhookView(APIView):
+    """Rebuild the shared pricing snapshot when Stripe reports a catalog change.
+
+    Listens for price.* and product.* events (configure the endpoint in the
+    Stripe dashboard to send only those) and calls
+    landing.pricing.refresh_pricing() before acknowledging, so pricing can be
+    cached for hours rather than polled. Every event is signature-checked
+    against STRIPE_WEBHOOK_SECRET, and event IDs are remembered for
+    STRIPE_WEBHOOK_DEDUPE_TTL so Stripe's at-least-once redeliveries don't
+    trigger repeat rebuilds.
+    """
+    authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = []
+
+    PRICING_EVENT_PREFIXES = ('price.', 'product.')
 
     @extend_schema(
-        responses={200: OpenApiResponse(description="Pricing data")}
+        request=None,
+        responses={
+            200: OpenApiResponse(description="Event received"),
+            400: OpenApiResponse(description="Invalid payload or signature"),
+            503: OpenApiResponse(description="Webhook secret not configured, or the rebuild failed"),
+        }
     )
-    def get(self, request):
-        """Return pricing tiers as JSON, sourced from Stripe when billing is enabled."""
-        return Response({'tiers': tiers_as_dicts(get_pricing_tiers()), 'currency': 'USD'})
+    def post(self, request):
+        if not settings.STRIPE_WEBHOOK_SECRET:
+            logger.error('[stripe] Webhook received but STRIPE_WEBHOOK_SECRET is not set')
+            return Response({'received': False}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        try:
+            event = stripe.Webhook.construct_event(
+                request.body,
+                request.META.get('HTTP_STRIPE_SIGNATURE'),
+                settings.STRIPE_WEBHOOK_SECRET,
+            )
+        except (ValueError, stripe.SignatureVerificationError) as exc:
+            logger.warning('[stripe] Rejected webhook: %s', exc)
+            return Response({'received': False}, status=status.HTTP_400_BAD_REQUEST)
+
+        dedupe_key = 'stripe:webhook-event:{}'.format(event['id'])
+        if not cache.add(dedupe_key, True, settings.STRIPE_WEBHOOK_DEDUPE_TTL):
+            logger.info('[stripe] Ignoring duplicate webhook event %s', event['id'])
+            return Response({'received': True, 'duplicate': True})
+
+        if not event['type'].startswith(self.PRICING_EVENT_PREFIXES):
+            return Response({'received': True})
+
+        if not (settings.BILLING_ENABLED and settings.STRIPE_API_KEY):
+            return Response({'received': True})
+
+        logger.info('[stripe] %s (%s): rebuilding pricing snapshot', event['type'], event['id'])
+        if refresh_pricing() is None:
+            # Stripe errored or the breaker is open. Let Stripe redeliver --
+            # forget we saw this event.
+            logger.warning('[stripe] Rebuild for %s failed; asking Stripe to retry', event['id'])
+            cache.delete(dedupe_key)
+            return Response({'received': False}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.schedule_recheck()
+        return Response({'received': True})
+
+    RECHECK_KEY = 'stripe:webhook-recheck'
+
+    def schedule_recheck(self):
+        """Search (which landing.pricing uses) lags dashboard edits by up to
+        a minute, so the rebuild above can still see the old price. Rebuild
+        once more after STRIPE_WEBHOOK_RECHECK_DELAY seconds. A burst of
+        events shares one recheck: RECHECK_KEY is held (across workers) until
+        the pending one has run."""
+        delay = settings.STRIPE_WEBHOOK_RECHECK_DELAY
+        if delay > 0 and cache.add(self.RECHECK_KEY, True, delay):
+            timer = threading.Timer(delay, self.recheck)
+            timer.daemon = True
+            timer.start()
+
+    @classmethod
+    def recheck(cls):
+        cache.delete(cls.RECHECK_KEY)
+        refresh_pricing()
 
 
 class HealthCheckView(APIView):
-    """Health check endpoint for monitoring."""
+    """Health check endpoint for monitoring.
+
+    Anyone gets a coarse pricing health ('ok' or 'degraded'). The refresher's
+    full status -- breaker state, failure counts, cache stats -- is only
+    included for callers sending HEALTH_CHECK_TOKEN in the X-Health-Token
+    header, and never when no token is configured.
+    """
     permission_classes = [AllowAny]
     
     def get(self, request):
-        return Response({
+        body = {
             'status': 'healthy',
             'service': 'hubsign-landing',
-        })
+            'pricing': pricing_refresher.health(),
+        }
+        if self.is_internal(request):
+            body['pricing_status'] = pricing_refresher.status()
+        return Response(body)
+
+    @staticmethod
+    def is_internal(request) -> bool:
+        token = settings.HEALTH_CHECK_TOKEN
+        return bool(token) and constant_time_compare(request.headers.get('X-Health-Token', ''), token)
@@ -0,0 +1,18 @@
+"""
+ASGI config for HubSign Landing project.
+
+Serve with an ASGI server, e.g. ``uvicorn hubsign.asgi:application`` or
+``gunicorn -k uvicorn.workers.UvicornWorker hubsign.asgi:application``. The
+pricing and landing views are async, so one process keeps serving them while
+a cold pricing cache waits on Stripe.
+"""
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hubsign.settings')
+application = get_asgi_application()
+
+# Prewarm pricing and start its background refresher before serving traffic.
+from landing.startup import warm_up  # noqa: E402
+
+warm_up()
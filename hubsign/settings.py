@@ -55,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'csp.middleware.CSPMiddleware',
+    'landing.middleware.EarlyHintsMiddleware',
 ]
 
 ROOT_URLCONF = 'hubsign.urls'
@@ -103,7 +104,42 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+# whitenoise's CompressedStaticFilesStorage, plus image optimization and
+# responsive variants (landing.images).
+STATICFILES_STORAGE = 'landing.storage.OptimizedStaticFilesStorage'
+
+# Images collectstatic makes responsive variants of, with the height in CSS
+# pixels main.css displays them at ({% picture %} in landing/templatetags/images.py).
+RESPONSIVE_IMAGES = {
+    'images/hubsign_logo.png': 64,  # .logo img, .footer-logo: 4rem
+    'images/fepro_logo.png': 40,    # .footer-powered-logo: 2.5rem
+}
+
+# Above-the-fold CSS extracted by `manage.py build_critical_css` and inlined
+# into the landing page (landing.critical_css).
+CRITICAL_CSS_DIR = os.environ.get('CRITICAL_CSS_DIR', str(BASE_DIR / 'build' / 'critical_css'))
+
+# Cache
+# Set DJANGO_CACHE_DIR to share cached data (e.g. Stripe pricing) between all
+# gunicorn workers on a host through the file-based backend; otherwise each
+# process gets its own local-memory cache.
+DJANGO_CACHE_DIR = os.environ.get('DJANGO_CACHE_DIR', '')
+CACHES = {
+    'default': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if DJANGO_CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': DJANGO_CACHE_DIR or 'hubsign',
+    },
+    # Rendered template fragments ({% cache %} in templates/landing/). Kept
+    # per process: they're cheaper to re-render than to read back from disk,
+    # and a deploy should start from empty.
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hubsign-fragments',
+    },
+}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -169,7 +205,7 @@ REST_FRAMEWORK = {
         'rest_framework.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '100/hour',
+        'anon': os.environ.get('API_ANON_THROTTLE_RATE', '100/hour'),
         'user': '1000/hour'
     }
 }
@@ -194,3 +230,100 @@ HUBSIGN_API_KEY = os.environ.get('HUBSIGN_API_KEY', '')
 BILLING_ENABLED = os.environ.get('NEXT_PUBLIC_FEATURE_BILLING_ENABLED', 'false').lower() in ('true', '1', 'yes')
 STRIPE_API_KEY = os.environ.get('NEXT_PRIVATE_STRIPE_API_KEY', '')
 STRIPE_WEBHOOK_SECRET = os.environ.get('NEXT_PRIVATE_STRIPE_WEBHOOK_SECRET', '')
+# Where the Stripe SDK sends pricing requests; empty means api.stripe.com. Set it
+# to a `manage.py stripe_standin` address for offline load tests.
+STRIPE_API_BASE = os.environ.get('STRIPE_API_BASE', '')
+
+# Landing copy (feature cards, fallback pricing) as data files, re-read when
+# they change (landing.content_registry). Point it at a mounted directory to
+# edit copy without a deploy.
+LANDING_CONTENT_DIR = os.environ.get('LANDING_CONTENT_DIR', str(BASE_DIR / 'landing' / 'content'))
+
+# Serve anonymous GETs of the landing page from a per-process cache of the
+# rendered HTML (landing.page_cache), re-rendered when pricing changes. Off
+# under DEBUG so template edits show up on reload.
+LANDING_PAGE_CACHE = os.environ.get('LANDING_PAGE_CACHE', str(not DEBUG)).lower() in ('true', '1', 'yes')
+
+# Stream landing page renders the page cache doesn't serve (visitors with a
+# session, or LANDING_PAGE_CACHE off): the <head> goes out before pricing is
+# resolved and each section follows as it renders. Off under DEBUG, where
+# django-browser-reload needs the whole page to inject its script.
+LANDING_STREAMING = os.environ.get('LANDING_STREAMING', str(not DEBUG)).lower() in ('true', '1', 'yes')
+
+# Fragment caching for the pricing grid, the Enterprise banner and the features
+# section of the landing page, for renders the page cache doesn't cover. Keys
+# carry the pricing fingerprint and the template version, so entries never go
+# stale; the timeout only bounds memory. 0 (the DEBUG default) disables it.
+LANDING_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get(
+    'LANDING_FRAGMENT_CACHE_TIMEOUT', '0' if DEBUG else str(24 * 60 * 60),
+))
+
+# Directory `manage.py export_static` publishes the pre-rendered landing page
+# and pricing JSON to, for nginx to serve as files. When set, each worker
+# also re-exports at startup, after pricing refreshes and periodically if the
+# published release is out of date.
+STATIC_EXPORT_ROOT = os.environ.get('STATIC_EXPORT_ROOT', '')
+
+# How often (seconds) each worker re-checks the export for changes that
+# don't come with a pricing refresh: landing copy edits, the footer year, and
+# prices when billing is off. 0 disables the periodic check.
+STATIC_EXPORT_CHECK_INTERVAL = int(os.environ.get('STATIC_EXPORT_CHECK_INTERVAL', '60'))
+
+# Pricing cache (landing.pricing.PricingCache): Stripe tiers are served from
+# memory for PRICING_CACHE_TTL seconds, then served stale for up to
+# PRICING_CACHE_STALE_TTL more seconds while one background refresh runs.
+PRICING_CACHE_TTL = int(os.environ.get('PRICING_CACHE_TTL', '60'))
+PRICING_CACHE_STALE_TTL = int(os.environ.get('PRICING_CACHE_STALE_TTL', '3600'))
+
+# Shared (cross-worker) pricing tier. Only one worker refreshes from Stripe at
+# a time; the lock expires after PRICING_REFRESH_LOCK_TIMEOUT seconds in case
+# the holder dies, and workers with nothing cached wait PRICING_REFRESH_WAIT
+# seconds for it before fetching themselves. With a webhook secret configured,
+# Stripe tells us when prices change (api.views.StripeWebhookView), so the
+# shared snapshot is kept for hours instead of being re-polled every minute.
+PRICING_CACHE_ALIAS = 'default'
+PRICING_SHARED_CACHE_TTL = int(os.environ.get(
+    'PRICING_SHARED_CACHE_TTL', str(6 * 60 * 60 if STRIPE_WEBHOOK_SECRET else PRICING_CACHE_TTL),
+))
+PRICING_REFRESH_LOCK_TIMEOUT = 30
+PRICING_REFRESH_WAIT = float(os.environ.get('PRICING_REFRESH_WAIT', '2'))
+
+# Stripe webhooks: event IDs are remembered this long so redeliveries are
+# ignored. Search results lag Price/Product edits by up to a minute, so each
+# pricing event also schedules a second rebuild this many seconds later.
+STRIPE_WEBHOOK_DEDUPE_TTL = 24 * 60 * 60
+STRIPE_WEBHOOK_RECHECK_DELAY = 60
+
+# Shared secret for the detailed /api/health/ output (pricing refresher and
+# Stripe breaker internals), sent as the X-Health-Token header. Unset, the
+# endpoint only ever reports coarse health.
+HEALTH_CHECK_TOKEN = os.environ.get('HEALTH_CHECK_TOKEN', '')
+
+# Background pricing refresher (landing.pricing.PricingRefresher), started per
+# worker from hubsign/wsgi.py. Keep it below PRICING_CACHE_TTL so requests
+# always find fresh tiers in memory; 0 disables it (the boot-time prewarm
+# still runs and requests fall back to refreshing on demand).
+PRICING_REFRESH_INTERVAL = int(os.environ.get('PRICING_REFRESH_INTERVAL', '30'))
+
+# Stripe call limits for pricing: each HTTP request gets PRICING_STRIPE_TIMEOUT
+# seconds (no SDK retries), and a whole paginated fetch PRICING_STRIPE_DEADLINE.
+# After PRICING_BREAKER_FAILURE_THRESHOLD consecutive failed fetches, Stripe is
+# not called at all for PRICING_BREAKER_RESET_TIMEOUT seconds; one probe fetch
+# then decides whether to resume.
+PRICING_STRIPE_TIMEOUT = float(os.environ.get('PRICING_STRIPE_TIMEOUT', '3'))
+PRICING_STRIPE_DEADLINE = float(os.environ.get('PRICING_STRIPE_DEADLINE', '8'))
+PRICING_BREAKER_FAILURE_THRESHOLD = 3
+PRICING_BREAKER_RESET_TIMEOUT = 30
+
+# Currencies pricing is published in, as Stripe currency codes (each Price
+# needs a matching currency_options entry), when PRICING_MULTI_CURRENCY is on.
+# USD, the fallback currency, is always published; visitors pick one with
+# ?currency= or the PRICING_CURRENCY_COOKIE cookie. Off, only USD is fetched
+# and published, and pages don't vary on the cookie. Leave it off until Team
+# and Enterprise have Stripe prices (landing.pricing._FALLBACK_ONLY_TIERS):
+# until then no other currency can be priced in full.
+PRICING_MULTI_CURRENCY = os.environ.get('PRICING_MULTI_CURRENCY', 'false').lower() in ('true', '1', 'yes')
+PRICING_CURRENCIES = [
+    code.strip().lower() for code in os.environ.get('PRICING_CURRENCIES', 'usd').split(',') if code.strip()
+]
+PRICING_CURRENCY_COOKIE = 'pricing_currency'
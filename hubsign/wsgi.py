@@ -6,3 +6,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hubsign.settings')
 application = get_wsgi_application()
+
+# Prewarm pricing and start its background refresher before serving traffic.
+from landing.startup import warm_up  # noqa: E402
+
+warm_up()
@@ -0,0 +1,102 @@
+"""Landing copy loaded from the data files in LANDING_CONTENT_DIR
+(landing/content/ by default), so marketing edits don't need a deploy.
+
+Each file is parsed and turned into immutable objects once, then handed out
+as-is to every request; the file is only re-read when its mtime changes.
+Caches of anything rendered from it key on content_version() (or, for
+pricing, on the snapshot fingerprint), so an edit shows up on the next
+request without any explicit invalidation.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Feature:
+    title: str
+    description: str
+    icon: str
+
+
+class ContentRegistry:
+    """Content by file name. load(name, build) returns build(data, mtime)
+    for the file's parsed JSON, rebuilding only when the file's mtime has
+    moved since the last load. If an edited file doesn't parse or goes
+    missing, the last good content keeps being served (and the error logged)
+    until it is back."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def load(self, name: str, build):
+        path = Path(settings.LANDING_CONTENT_DIR) / name
+        entry = self._entries.get(name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            # Briefly absent, e.g. mid-replace by a deploy tool.
+            if entry is None:
+                raise
+            logger.warning('[content] %s is missing; keeping the previous version', path)
+            return entry[1]
+        if entry is not None and entry[0] == (path, mtime):
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == (path, mtime):
+                return entry[1]
+            try:
+                value = build(json.loads(path.read_text()), mtime / 1e9)
+            except (OSError, ValueError, KeyError, TypeError):
+                if entry is None:
+                    raise
+                logger.exception('[content] %s is invalid; keeping the previous version', path)
+                value = entry[1]
+            else:
+                if entry is not None:
+                    logger.info('[content] Reloaded %s', path)
+            self._entries[name] = ((path, mtime), value)
+            return value
+
+
+content = ContentRegistry()
+
+
+def content_version() -> str:
+    """Changes whenever any content file does: a hash of their names and
+    mtimes, one scandir() away."""
+    digest = hashlib.sha256()
+    try:
+        with os.scandir(settings.LANDING_CONTENT_DIR) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                try:
+                    digest.update('{}:{}\n'.format(entry.name, entry.stat().st_mtime_ns).encode())
+                except OSError:
+                    continue  # removed since the scandir()
+    except OSError:
+        logger.warning('[content] %s is missing', settings.LANDING_CONTENT_DIR)
+    return digest.hexdigest()[:16]
+
+
+def get_features() -> tuple[Feature, ...]:
+    """The feature cards shown on the landing and features pages."""
+    return content.load('features.json', _build_features)
+
+
+def _build_features(data: dict, mtime: float) -> tuple[Feature, ...]:
+    return tuple(Feature(**feature) for feature in data['features'])
@@ -0,0 +1,215 @@
+"""Critical CSS for the landing page: the rules of static/css/main.css that
+the above-the-fold markup (the header and the hero section) needs, inlined
+into the page so it can paint before the full stylesheet -- which then loads
+without blocking -- arrives.
+
+`manage.py build_critical_css` (run in the Docker build, after collectstatic)
+renders the page, collects the tags, classes and ids above the fold and keeps
+every rule whose selectors only use those, plus the @media blocks and
+@keyframes they need. Results are stored in CRITICAL_CSS_DIR under the hash
+of the stylesheet and the fold's selectors, so a rebuild with neither changed
+reuses the previous extraction.
+
+At runtime {% critical_css %} inlines the result only while it was built from
+the main.css being served; anything else (no build, a stale one) falls back
+to the plain render-blocking stylesheet.
+"""
+import functools
+import hashlib
+import json
+import logging
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.utils.safestring import SafeString, mark_safe
+
+logger = logging.getLogger(__name__)
+
+STYLESHEET = 'css/main.css'
+MANIFEST = 'manifest.json'
+
+_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_COMBINATOR = re.compile(r'\s*[>+~]\s*|\s+')
+_SIMPLE = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*)')
+_PARENS = re.compile(r'\([^()]*\)')
+
+
+def critical_css_for(template_name: str) -> SafeString:
+    """The built critical CSS for template_name, or '' if there is none for
+    the current stylesheet. Read once per process (every call under DEBUG)."""
+    built = _read_built(template_name) if settings.DEBUG else _load_built(template_name)
+    return built or mark_safe('')
+
+
+@functools.lru_cache(maxsize=None)
+def _load_built(template_name: str) -> SafeString | None:
+    return _read_built(template_name)
+
+
+def _read_built(template_name: str) -> SafeString | None:
+    out_dir = Path(settings.CRITICAL_CSS_DIR)
+    try:
+        entry = json.loads((out_dir / MANIFEST).read_text())[template_name]
+    except (OSError, ValueError, KeyError):
+        return None
+    if entry['stylesheet'] != stylesheet_hash():
+        logger.warning('[critical-css] %s was built from another main.css; run build_critical_css', template_name)
+        return None
+    return mark_safe((out_dir / entry['file']).read_text())
+
+
+def stylesheet_hash() -> str:
+    return hashlib.sha256(_stylesheet_path().read_bytes()).hexdigest()[:16]
+
+
+def build(template_name: str, html: str) -> tuple[str, bool]:
+    """Extract and store the critical CSS for template_name's rendered html.
+    Returns (file name, whether it was extracted rather than reused)."""
+    css = _stylesheet_path().read_text()
+    fold = above_the_fold(html)
+    key = hashlib.sha256(css.encode())
+    key.update(json.dumps([sorted(names) for names in fold]).encode())
+    file_name = '{}.css'.format(key.hexdigest()[:16])
+
+    out_dir = Path(settings.CRITICAL_CSS_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    extracted = not (out_dir / file_name).exists()
+    if extracted:
+        (out_dir / file_name).write_text(extract_critical_css(css, *fold))
+
+    manifest_path = out_dir / MANIFEST
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+    manifest[template_name] = {'file': file_name, 'stylesheet': stylesheet_hash()}
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    _load_built.cache_clear()
+    return file_name, extracted
+
+
+def _stylesheet_path() -> Path:
+    return Path(finders.find(STYLESHEET))
+
+
+class _FoldParser(HTMLParser):
+    """Collects tag names, classes and ids from <body> up to the end of the
+    first <section>."""
+
+    def __init__(self):
+        super().__init__()
+        self.tags = {'html', 'body'}
+        self.classes = set()
+        self.ids = set()
+        self.in_body = False
+        self.section_depth = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self.in_body = True
+        if self.done or not self.in_body:
+            return
+        if tag == 'section':
+            self.section_depth += 1
+        self.tags.add(tag)
+        attrs = dict(attrs)
+        self.classes.update((attrs.get('class') or '').split())
+        if attrs.get('id'):
+            self.ids.add(attrs['id'])
+
+    def handle_endtag(self, tag):
+        if tag == 'section' and self.section_depth and not self.done:
+            self.section_depth -= 1
+            self.done = self.section_depth == 0
+
+
+def above_the_fold(html: str) -> tuple[set, set, set]:
+    """(tags, classes, ids) used in html's header and first section."""
+    parser = _FoldParser()
+    parser.feed(html)
+    return parser.tags, parser.classes, parser.ids
+
+
+def extract_critical_css(css: str, tags, classes, ids) -> str:
+    """The rules of css whose selectors only reference the given tags,
+    classes and ids, minified. Pseudo-classes and attribute selectors don't
+    disqualify a selector; an @media block is kept with whichever of its
+    rules qualify, and a @keyframes block if a kept rule names it."""
+    blocks = _parse_blocks(_COMMENT.sub('', css))
+    critical = ''.join(_select(blocks, tags, classes, ids))
+    for prelude, block in blocks:
+        if prelude.startswith('@keyframes'):
+            name = prelude.split()[1]
+            if re.search(r'(?<![\w-]){}(?![\w-])'.format(re.escape(name)), critical):
+                critical += '{}{{{}}}'.format(_minify(prelude), _minify(block))
+    return critical
+
+
+def _select(blocks, tags, classes, ids) -> list[str]:
+    kept = []
+    for prelude, block in blocks:
+        if prelude.startswith('@media') or prelude.startswith('@supports'):
+            inner = _select(_parse_blocks(block), tags, classes, ids)
+            if inner:
+                kept.append('{}{{{}}}'.format(_minify(prelude), ''.join(inner)))
+        elif prelude.startswith('@'):
+            continue
+        else:
+            selectors = [s for s in prelude.split(',') if _matches(s, tags, classes, ids)]
+            if selectors:
+                kept.append('{}{{{}}}'.format(','.join(_minify_selector(s) for s in selectors), _minify(block)))
+    return kept
+
+
+def _matches(selector: str, tags, classes, ids) -> bool:
+    selector = _PARENS.sub('', re.sub(r'\[[^\]]*\]', '', selector)).strip()
+    for compound in _COMBINATOR.split(selector):
+        compound = re.sub(r'::?[\w-]+', '', compound)
+        for kind, name in _SIMPLE.findall(compound):
+            if kind == '.' and name not in classes:
+                return False
+            if kind == '#' and name not in ids:
+                return False
+            if not kind and name.lower() not in tags:
+                return False
+    return True
+
+
+def _parse_blocks(css: str) -> list[tuple[str, str]]:
+    """Top-level (prelude, block contents) pairs of css; statements without a
+    block (@import, @charset) are dropped."""
+    blocks = []
+    depth = 0
+    start = 0
+    prelude = ''
+    for i, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude = css[start:i].strip()
+                start = i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:i]))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            start = i + 1
+    return blocks
+
+
+def _minify(text: str) -> str:
+    """Declarations or an at-rule prelude, without optional whitespace."""
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'\s*([{};:,])\s*', r'\1', text)
+    return text.replace(';}', '}').rstrip(';')
+
+
+def _minify_selector(selector: str) -> str:
+    # Whitespace before ':' is a descendant combinator in a selector.
+    selector = re.sub(r'\s+', ' ', selector).strip()
+    return re.sub(r'\s*([>+~])\s*', r'\1', selector)
@@ -0,0 +1,41 @@
+"""SVG icons from templates/components/icons/, read once per process.
+
+The icon markup is static, so there's nothing for the template engine to do
+with it: {% icon %} (landing/templatetags/icons.py) looks the markup up here
+instead of resolving and rendering an include for every icon on every page.
+Under DEBUG the files are re-read on each lookup so edits show up on reload.
+"""
+import functools
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.safestring import SafeString, mark_safe
+
+logger = logging.getLogger(__name__)
+
+ICON_DIR = Path('components') / 'icons'
+
+
+def icon_svg(name: str) -> SafeString:
+    """The <svg> markup for icon name, or an empty string (logged) if there
+    is no such icon."""
+    svg = (read_icons() if settings.DEBUG else load_icons()).get(name)
+    if svg is None:
+        logger.warning('[icons] Unknown icon %r', name)
+        return mark_safe('')
+    return svg
+
+
+@functools.lru_cache(maxsize=1)
+def load_icons() -> dict[str, SafeString]:
+    return read_icons()
+
+
+def read_icons() -> dict[str, SafeString]:
+    icons = {}
+    for backend in settings.TEMPLATES:
+        for template_dir in backend.get('DIRS', ()):
+            for path in sorted((Path(template_dir) / ICON_DIR).glob('*.svg')):
+                icons.setdefault(path.stem, mark_safe(path.read_text().strip()))
+    return icons
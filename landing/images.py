@@ -0,0 +1,184 @@
+"""Offline optimization of the images under static/ (the project's own,
+not those collected from apps), run by
+landing.storage.OptimizedStaticFilesStorage as part of collectstatic.
+
+- SVGs are minified: comments, metadata and editor cruft dropped, path
+  coordinates rounded to three decimals, whitespace between tags (outside
+  <text>) removed, and any embedded PNGs recompressed as below.
+- PNGs are recompressed losslessly: ancillary chunks (EXIF, text, pHYs...)
+  are dropped and the image data re-deflated at the highest level. Nothing
+  is replaced unless it comes out smaller.
+- The images listed in RESPONSIVE_IMAGES get PNG and WebP variants at 1x and
+  2x the height the stylesheet displays them at (never upscaled), recorded
+  in IMAGE_MANIFEST for {% picture %} (landing/templatetags/images.py).
+  Resizing and WebP need Pillow; without it the variants are skipped and
+  {% picture %} falls back to a plain <img>.
+
+collectstatic records the bytes saved per file in IMAGE_MANIFEST;
+`manage.py optimize_images` reports the same for the source images without
+writing anything.
+"""
+import base64
+import functools
+import json
+import logging
+import re
+import struct
+import zlib
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional in development
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MANIFEST = 'images/manifest.json'
+DENSITIES = (1, 2)
+WEBP_QUALITY = 90
+
+_DECIMAL = re.compile(r'-?\d*\.\d+(?:[eE][-+]?\d+)?')
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Chunks that affect how the image looks; everything else is metadata.
+_PNG_KEPT_CHUNKS = {b'IHDR', b'PLTE', b'tRNS', b'gAMA', b'cHRM', b'sRGB', b'iCCP', b'IDAT', b'IEND'}
+
+
+def optimize(name: str, data: bytes) -> bytes:
+    """data optimized for name's type, or data itself if it can't be made
+    smaller."""
+    if name.endswith('.svg'):
+        optimized = minify_svg(data.decode()).encode()
+    elif name.endswith('.png'):
+        optimized = optimize_png(data)
+    else:
+        return data
+    return optimized if len(optimized) < len(data) else data
+
+
+def optimize_png(data: bytes) -> bytes:
+    if not data.startswith(_PNG_SIGNATURE):
+        return data
+    chunks = list(_png_chunks(data))
+    idat = b''.join(body for kind, body in chunks if kind == b'IDAT')
+    recompressed = zlib.compress(zlib.decompress(idat), 9)
+    if len(recompressed) > len(idat):
+        recompressed = idat
+
+    out = [_PNG_SIGNATURE]
+    for kind, body in chunks:
+        if kind == b'IDAT':
+            if recompressed is not None:
+                out.append(_png_chunk(b'IDAT', recompressed))
+                recompressed = None
+        elif kind in _PNG_KEPT_CHUNKS:
+            out.append(_png_chunk(kind, body))
+    optimized = b''.join(out)
+    return optimized if len(optimized) < len(data) else data
+
+
+def _png_chunks(data: bytes):
+    offset = len(_PNG_SIGNATURE)
+    while offset < len(data):
+        length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        yield kind, data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+
+
+def _png_chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+
+def minify_svg(svg: str) -> str:
+    svg = re.sub(r'<!--.*?-->', '', svg, flags=re.S)
+    svg = re.sub(r'<\?xml.*?\?>|<!DOCTYPE[^>]*>', '', svg, flags=re.S)
+    svg = re.sub(r'<metadata\b.*?</metadata>', '', svg, flags=re.S)
+    svg = re.sub(r'<(sodipodi|inkscape):[^>]*?(/>|>.*?</\1:[^>]*>)', '', svg, flags=re.S)
+    svg = re.sub(r'\s(sodipodi|inkscape|xmlns:sodipodi|xmlns:inkscape)(:[\w-]+)?="[^"]*"', '', svg)
+    svg = re.sub(r'data:image/png;base64,([A-Za-z0-9+/=\s]+)', _recompress_embedded_png, svg)
+    # Only path coordinates: rounding a transform's scale would move the
+    # whole drawing.
+    svg = re.sub(r'(\s(?:d|points)=")([^"]*)"', _round_numbers, svg)
+    # Whitespace between <text>/<tspan> children is rendered; leave it.
+    texts = re.findall(r'<text\b.*?</text>', svg, flags=re.S)
+    svg = re.sub(r'>\s+<', '><', re.sub(r'<text\b.*?</text>', '<\0/>', svg, flags=re.S))
+    svg = re.sub('<\0/>', lambda _: texts.pop(0), svg)
+    return svg.strip()
+
+
+def _recompress_embedded_png(match) -> str:
+    data = base64.b64decode(re.sub(r'\s', '', match.group(1)))
+    return 'data:image/png;base64,' + base64.b64encode(optimize_png(data)).decode()
+
+
+def _round_numbers(match) -> str:
+    values = _DECIMAL.sub(_round_number, match.group(2))
+    return '{}{}"'.format(match.group(1), re.sub(r'\s+', ' ', values).strip())
+
+
+def _round_number(match) -> str:
+    """A decimal in path data, rounded. Compact path data runs numbers
+    together ("M1.0001.5" is 1.0001 then .5), so a space is added wherever
+    the rounded number would now merge with its neighbour."""
+    rounded = '{:.3f}'.format(float(match.group(0))).rstrip('0').rstrip('.')
+    rounded = re.sub(r'^(-?)0\.', r'\1.', '0' if rounded == '-0' else rounded)
+    text, start, end = match.string, match.start(), match.end()
+    if start and (text[start - 1].isdigit() or text[start - 1] == '.') and rounded[0].isdigit():
+        rounded = ' ' + rounded
+    if end < len(text) and (text[end].isdigit() or text[end] == '.') and '.' not in rounded:
+        rounded += ' '
+    return rounded
+
+
+def responsive_variants(name: str, data: bytes, display_height: int) -> dict[str, bytes]:
+    """PNG and WebP renditions of the PNG data at each of DENSITIES times
+    display_height CSS pixels, capped at its own size: {variant name: bytes}.
+    The full-size PNG keeps name; other renditions are named
+    <stem>.<width>w.<ext>. Empty without Pillow."""
+    if Image is None:
+        return {}
+    source = Image.open(BytesIO(data))
+    stem = name.rsplit('.', 1)[0]
+    variants = {}
+    for height in sorted({min(display_height * d, source.height) for d in DENSITIES}):
+        width = round(source.width * height / source.height)
+        image = source if height == source.height else source.resize((width, height), Image.LANCZOS)
+        suffix = '' if height == source.height else '.{}w'.format(width)
+        if suffix:
+            variants['{}{}.png'.format(stem, suffix)] = optimize_png(_encode(image, 'PNG', optimize=True))
+        variants['{}{}.webp'.format(stem, suffix)] = _encode(image, 'WEBP', quality=WEBP_QUALITY, method=6)
+    return variants
+
+
+def _encode(image, image_format: str, **options) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def variant_width(variant_name: str, full_width: int) -> int:
+    match = re.search(r'\.(\d+)w\.\w+$', variant_name)
+    return int(match.group(1)) if match else full_width
+
+
+def image_size(data: bytes) -> tuple[int, int]:
+    """(width, height) from a PNG's IHDR."""
+    return struct.unpack('>II', data[16:24])
+
+
+def image_manifest() -> dict:
+    """IMAGE_MANIFEST as written by the last collectstatic, read once per
+    process; {} under DEBUG, where static files are served uncollected."""
+    return {} if settings.DEBUG else _load_manifest()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_manifest() -> dict:
+    try:
+        with staticfiles_storage.open(IMAGE_MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,114 @@
+import time
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from landing import pricing
+from landing.pricing import PriceIndex
+from landing.stripe_standin import synthetic_prices
+
+
+class _SyntheticPrice:
+    def __init__(self, d):
+        self._d = d
+
+    def to_dict(self):
+        return self._d
+
+
+class _SyntheticPage:
+    def __init__(self, data, next_page):
+        self.data = data
+        self.has_more = next_page is not None
+        self.next_page = next_page
+
+
+def synthetic_catalog(size: int, seed: int = 0) -> list[dict]:
+    """size active recurring prices across ~size/2 products with realistic
+    plan/type/tier metadata noise, with the wired products placed last so a
+    linear scan has to walk the whole list to find them."""
+    catalog = synthetic_prices(max(size - 6, 0), seed)
+    for wanted, amount in (
+        (pricing._INDIVIDUAL_PRODUCT, 1500),
+        (pricing._BUSINESS_SEAT_PRODUCT, 19900),
+        (pricing._BUSINESS_DOC_BLOCK_PRODUCT, 4500),
+    ):
+        product = {'active': True, 'metadata': dict(wanted)}
+        for interval, unit_amount in (('month', amount), ('year', amount * 10)):
+            catalog.append({
+                'id': 'price_{:06d}'.format(len(catalog)),
+                'unit_amount': unit_amount,
+                'currency': 'usd',
+                'recurring': {'interval': interval},
+                'product': product,
+            })
+    return catalog
+
+
+def linear_lookup(candidates: list[dict], selector: dict):
+    """The pre-index algorithm: filter the whole candidate list per selector,
+    then scan the matches again for each interval."""
+    matches = [
+        p for p in candidates
+        if all((p['product'].get('metadata') or {}).get(k) == v for k, v in selector.items())
+    ]
+    monthly = next((p for p in matches if p['recurring']['interval'] == 'month'), None)
+    yearly = next((p for p in matches if p['recurring']['interval'] == 'year'), None)
+    return monthly, yearly
+
+
+class Command(BaseCommand):
+    help = (
+        'Micro-benchmark Stripe tier resolution in landing.pricing on synthetic '
+        'catalogs: linear scans vs PriceIndex, plus an end-to-end paginated fetch.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000, 20000])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        selectors = pricing._STRIPE_PRODUCTS
+        self.stdout.write('{:>8}  {:>12}  {:>12}  {:>14}'.format(
+            'prices', 'linear ms', 'index ms', 'fetch ms',
+        ))
+        for size in options['sizes']:
+            catalog = synthetic_catalog(size)
+
+            linear = self.best_of(repeat, lambda: [linear_lookup(catalog, s) for s in selectors])
+            indexed = self.best_of(repeat, lambda: self.index_and_lookup(catalog, selectors))
+            fetch = self.best_of(max(1, repeat // 4), lambda: self.fetch(catalog))
+
+            self.stdout.write('{:>8}  {:>12.3f}  {:>12.3f}  {:>14.3f}'.format(
+                size, linear * 1000, indexed * 1000, fetch * 1000,
+            ))
+
+    @staticmethod
+    def index_and_lookup(catalog, selectors):
+        index = PriceIndex(selectors, catalog)
+        return [index.lookup(s) for s in selectors]
+
+    @staticmethod
+    def fetch(catalog):
+        pages = [
+            _SyntheticPage(
+                [_SyntheticPrice(p) for p in catalog[i:i + pricing._STRIPE_PAGE_SIZE]],
+                next_page='page_{}'.format(i) if i + pricing._STRIPE_PAGE_SIZE < len(catalog) else None,
+            )
+            for i in range(0, len(catalog), pricing._STRIPE_PAGE_SIZE)
+        ]
+        with override_settings(STRIPE_API_KEY='sk_bench'), \
+                patch('landing.pricing.stripe.Price.search', side_effect=pages):
+            tiers = pricing._fetch_from_stripe()[pricing.FALLBACK_CURRENCY]
+        assert tiers[3].price_monthly == 199, 'benchmark catalog did not resolve'
+
+    @staticmethod
+    def best_of(repeat, fn):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
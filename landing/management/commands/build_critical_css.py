@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from landing import critical_css
+from landing.pricing import get_pricing_snapshot
+from landing.static_export import render_page
+from landing.views import IndexView
+
+PAGES = {
+    'landing/index.html': IndexView,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Extract the above-the-fold CSS of the landing page from main.css into '
+        'CRITICAL_CSS_DIR, for the page to inline. Extractions are cached by '
+        'the hash of main.css and the fold markup, so unchanged pages are skipped.'
+    )
+
+    def handle(self, *args, **options):
+        full_size = critical_css._stylesheet_path().stat().st_size
+        snapshot = get_pricing_snapshot()
+        for template_name, view_class in PAGES.items():
+            file_name, extracted = critical_css.build(template_name, render_page(view_class, snapshot).decode())
+            size = len(critical_css.critical_css_for(template_name).encode())
+            self.stdout.write('{}: {} ({}, {:.1f} of {:.1f} KB)'.format(
+                template_name, file_name, 'extracted' if extracted else 'unchanged',
+                size / 1024, full_size / 1024,
+            ))
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from landing.static_export import export_if_stale, export_site
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the landing page and the default pricing JSON into a new '
+        'release under the export directory and atomically publish it as '
+        '<dir>/current, for nginx to serve without touching Django.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.STATIC_EXPORT_ROOT,
+                            help='Export directory (default: STATIC_EXPORT_ROOT).')
+        parser.add_argument('--if-stale', action='store_true',
+                            help='Skip the export if the published release is already current.')
+
+    def handle(self, *args, **options):
+        root = options['output']
+        if not root:
+            raise CommandError('Pass --output or set STATIC_EXPORT_ROOT.')
+        release = export_if_stale(root) if options['if_stale'] else export_site(root)
+        if release is None:
+            self.stdout.write('Published release is current; nothing to do.')
+        else:
+            self.stdout.write(self.style.SUCCESS('Published {}.'.format(release)))
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from landing import images
+
+
+class Command(BaseCommand):
+    help = (
+        'Report the bytes collectstatic saves on each static image (see '
+        'landing.images), and the responsive variants it would generate. '
+        'Nothing is written.'
+    )
+
+    def handle(self, *args, **options):
+        total_before = total_after = 0
+        for static_dir in settings.STATICFILES_DIRS:
+            for path in sorted(Path(static_dir).rglob('*')):
+                if path.suffix not in ('.svg', '.png'):
+                    continue
+                name = path.relative_to(static_dir).as_posix()
+                data = path.read_bytes()
+                optimized = images.optimize(name, data)
+                total_before += len(data)
+                total_after += len(optimized)
+                self.stdout.write('{:<32} {:>8} -> {:>8} bytes  ({:.0%} saved)'.format(
+                    name, len(data), len(optimized), 1 - len(optimized) / len(data),
+                ))
+                display_height = settings.RESPONSIVE_IMAGES.get(name)
+                if display_height:
+                    variants = images.responsive_variants(name, optimized, display_height)
+                    if not variants:
+                        self.stdout.write('    (variants need Pillow)')
+                    for variant, body in variants.items():
+                        self.stdout.write('    {:<28} {:>8} bytes'.format(variant, len(body)))
+
+        self.stdout.write(self.style.SUCCESS('{} -> {} bytes ({} saved).'.format(
+            total_before, total_after, total_before - total_after,
+        )))
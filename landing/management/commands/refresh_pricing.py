@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from landing.pricing import refresh_pricing
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the pricing snapshot from Stripe and publish it to the shared cache.'
+
+    def handle(self, *args, **options):
+        pricing = refresh_pricing()
+        if not pricing:
+            raise CommandError('Pricing was not refreshed (billing disabled or Stripe fetch failed).')
+        for currency in pricing.currencies:
+            snapshot = pricing.in_currency(currency)
+            self.stdout.write(currency.upper())
+            for tier in snapshot.tiers:
+                self.stdout.write('  {:<12} {}{}/mo  {}{}/mo annually'.format(
+                    tier.id, snapshot.symbol, tier.price_monthly, snapshot.symbol, tier.price_annually,
+                ))
+        self.stdout.write(self.style.SUCCESS('Pricing snapshot refreshed.'))
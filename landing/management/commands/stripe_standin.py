@@ -0,0 +1,75 @@
+import json
+
+import stripe
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from landing import pricing
+from landing.stripe_standin import RECORDED_CATALOG, StripeStandin, load_catalog, synthetic_prices
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve a recorded Stripe price catalog on a local Price.search stand-in, '
+        'with optional latency, error injection and synthetic padding, for '
+        'offline load tests of landing.pricing. Point STRIPE_API_BASE at it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=12111)
+        parser.add_argument('--catalog', default=str(RECORDED_CATALOG),
+                            help='Recorded Price.search result to replay.')
+        parser.add_argument('--size', type=int, default=0,
+                            help='Pad the catalog with synthetic prices up to this many.')
+        parser.add_argument('--latency', type=float, default=0.0, help='Per-response delay, ms.')
+        parser.add_argument('--jitter', type=float, default=0.0,
+                            help='Extra uniform random delay of up to this many ms.')
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Share of responses (0-1) to fail.')
+        parser.add_argument('--error-status', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--record', metavar='PATH',
+                            help='Record the live catalog from Stripe to PATH and exit.')
+
+    def handle(self, *args, **options):
+        if options['record']:
+            return self.record(options['record'])
+
+        prices = load_catalog(options['catalog'])
+        if options['size'] > len(prices):
+            # Noise first, so the recorded (wired) prices land on the last pages.
+            prices = synthetic_prices(options['size'] - len(prices), options['seed'] or 0) + prices
+
+        standin = StripeStandin(
+            prices,
+            latency=options['latency'] / 1000,
+            jitter=options['jitter'] / 1000,
+            error_rate=options['error_rate'],
+            error_status=options['error_status'],
+            seed=options['seed'],
+        )
+        self.stdout.write('Serving {} prices on http://{}:{} -- set STRIPE_API_BASE to that.'.format(
+            len(prices), options['host'], options['port'],
+        ))
+        try:
+            standin.serve_forever(options['host'], options['port'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('{} requests served, {} failed on purpose.'.format(standin.requests, standin.errors))
+
+    def record(self, path):
+        if not settings.STRIPE_API_KEY:
+            raise CommandError('Recording needs STRIPE_API_KEY.')
+        stripe.api_key = settings.STRIPE_API_KEY
+        stripe.api_base = stripe.DEFAULT_API_BASE
+        prices = list(pricing._iter_stripe_prices())
+        with open(path, 'w') as f:
+            json.dump({
+                'object': 'search_result',
+                'data': prices,
+                'has_more': False,
+                'next_page': None,
+                'url': '/v1/prices/search',
+            }, f, indent=2)
+        self.stdout.write(self.style.SUCCESS('Recorded {} prices to {}.'.format(len(prices), path)))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from landing.startup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile every project template as each worker does at startup and '
+        'report how long each one took, slowest first.'
+    )
+
+    def handle(self, *args, **options):
+        timings = warm_templates()
+        for name, elapsed in sorted(timings, key=lambda t: t[1], reverse=True):
+            self.stdout.write('{:>8.2f} ms  {}'.format(elapsed * 1000, name))
+        self.stdout.write(self.style.SUCCESS('Compiled {} templates in {:.1f} ms.'.format(
+            len(timings), sum(elapsed for _, elapsed in timings) * 1000,
+        )))
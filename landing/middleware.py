@@ -0,0 +1,87 @@
+"""Preload hints for the landing pages.
+
+Every landing page needs the same handful of resources from base.html: the
+stylesheet, main.js, the header logo and the Google Fonts stylesheet (plus
+connections to its two origins). EarlyHintsMiddleware announces them before
+the view runs -- while it may still be waiting on pricing -- as a 103 Early
+Hints response when the server offers one (gunicorn's wsgi.early_hints) to
+an HTTP/1.1 client, and otherwise as a Link header on the final response.
+
+The links point at the URLs staticfiles_storage serves and at the logo
+variants {% picture %} picks from, so they only change with the templates
+and static files and are built once per template/static version.
+"""
+import functools
+import logging
+
+from django.templatetags.static import static
+from django.utils.deprecation import MiddlewareMixin
+
+from .images import image_manifest
+from .page_cache import static_version, template_version
+
+logger = logging.getLogger(__name__)
+
+# Keep in step with templates/base.html.
+FONTS_STYLESHEET = (
+    'https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700'
+    '&family=Plus+Jakarta+Sans:wght@400;500;600;700;800&display=swap'
+)
+PRECONNECT = ('https://fonts.googleapis.com', 'https://fonts.gstatic.com')
+PRELOAD = (('css/main.css', 'style'), ('js/main.js', 'script'))
+LOGO = 'images/hubsign_logo.png'
+
+
+def preload_links() -> tuple[str, ...]:
+    """Link header values for the landing pages."""
+    return _build_links(template_version(), static_version())
+
+
+@functools.lru_cache(maxsize=1)
+def _build_links(template_version: str, static_version: str) -> tuple[str, ...]:
+    links = ['<{}>; rel=preconnect'.format(PRECONNECT[0])]
+    links += ['<{}>; rel=preconnect; crossorigin'.format(origin) for origin in PRECONNECT[1:]]
+    links.append('<{}>; rel=preload; as=style'.format(FONTS_STYLESHEET))
+    links += ['<{}>; rel=preload; as={}'.format(static(name), kind) for name, kind in PRELOAD]
+    links.append(_logo_link())
+    return tuple(links)
+
+
+def _logo_link() -> str:
+    entry = image_manifest().get('images', {}).get(LOGO)
+    if not entry or not entry['webp']:
+        return '<{}>; rel=preload; as=image'.format(static(LOGO))
+    # The href is the 1x WebP, for browsers that honour type but not
+    # imagesrcset; it has to match type either way.
+    srcset = ', '.join('{} {}w'.format(static(variant), width) for width, variant in entry['webp'])
+    return '<{}>; rel=preload; as=image; type="image/webp"; imagesrcset="{}"; imagesizes="{}px"'.format(
+        static(entry['webp'][0][1]), srcset, entry['width'],
+    )
+
+
+class EarlyHintsMiddleware(MiddlewareMixin):
+    """Preload hints for GETs of the landing app's pages (see the module
+    docstring). Other apps' responses are left alone."""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if request.method not in ('GET', 'HEAD') or match is None or match.app_name != 'landing':
+            return None
+        links = preload_links()
+        send_early_hints = request.META.get('wsgi.early_hints')
+        # gunicorn drops hints for HTTP/1.0 clients, which is how nginx
+        # proxies by default; those get the header instead.
+        if send_early_hints is not None and request.META.get('SERVER_PROTOCOL') != 'HTTP/1.0':
+            try:
+                send_early_hints([('Link', link) for link in links])
+                return None
+            except Exception:
+                logger.exception('[early-hints] Sending 103 failed; falling back to a Link header')
+        request._preload_links = links
+        return None
+
+    def process_response(self, request, response):
+        links = getattr(request, '_preload_links', None)
+        if links and response.status_code == 200 and 'Link' not in response:
+            response['Link'] = ', '.join(links)
+        return response
@@ -0,0 +1,109 @@
+"""Per-process cache of fully rendered landing pages.
+
+A page's HTML only changes with the pricing snapshot it shows, the templates
+and static files it was rendered from (both fixed for the life of a deploy),
+the landing copy (landing.content_registry) and the footer year, so that's
+what it is keyed on: a price change moves the snapshot fingerprint and the
+next request renders afresh, with no explicit invalidation. The one
+per-request value, the CSRF token, is rendered as CSRF_PLACEHOLDER and
+swapped in on the way out, so a hit never touches the template engine.
+"""
+import functools
+import hashlib
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.middleware.csrf import get_token
+
+from .content_registry import content_version
+
+CSRF_PLACEHOLDER = '__hubsign_csrf_token_placeholder__'
+
+
+class RenderedPageCache:
+    """Rendered page bodies by key, at most max_entries of them -- a handful
+    of pricing versions times currencies. Entries are dropped wholesale when
+    full, as old pricing versions are never asked for again."""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._pages = {}
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key) -> bytes | None:
+        with self._lock:
+            body = self._pages.get(key)
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return body
+
+    def set(self, key, body: bytes):
+        with self._lock:
+            if len(self._pages) >= self.max_entries:
+                self._pages.clear()
+            self._pages[key] = body
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._pages), 'hits': self.hits, 'misses': self.misses}
+
+
+rendered_pages = RenderedPageCache()
+
+
+def page_cache_key(template_name: str, snapshot) -> tuple:
+    return (
+        template_name, snapshot.fingerprint, template_version(), static_version(),
+        content_version(), time.localtime().tm_year,
+    )
+
+
+def is_cacheable(request) -> bool:
+    """Anonymous GETs only. "Anonymous" is judged by the absence of a session
+    cookie rather than request.user, which would need a (sync) session lookup
+    from async views."""
+    return (
+        settings.LANDING_PAGE_CACHE
+        and request.method in ('GET', 'HEAD')
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def with_csrf_token(body: bytes, request) -> bytes:
+    """body with this request's CSRF token in place of CSRF_PLACEHOLDER.
+    get_token() also makes CsrfViewMiddleware set the cookie, as rendering
+    {{ csrf_token }} would."""
+    return body.replace(CSRF_PLACEHOLDER.encode(), get_token(request).encode())
+
+
+@functools.lru_cache(maxsize=1)
+def template_version() -> str:
+    dirs = [d for backend in settings.TEMPLATES for d in backend.get('DIRS', ())]
+    return _tree_version(dirs)
+
+
+@functools.lru_cache(maxsize=1)
+def static_version() -> str:
+    return _tree_version(settings.STATICFILES_DIRS)
+
+
+def _tree_version(dirs) -> str:
+    """Hash of every file's path, size and mtime under dirs. Computed once
+    per process: templates and static files only change with a deploy."""
+    digest = hashlib.sha256()
+    for root_dir in dirs:
+        for root, _, files in sorted(os.walk(root_dir)):
+            for name in sorted(files):
+                stat = os.stat(os.path.join(root, name))
+                digest.update('{}/{}:{}:{}\n'.format(root, name, stat.st_size, stat.st_mtime_ns).encode())
+    return digest.hexdigest()[:16]
@@ -1,14 +1,39 @@
+import functools
+import hashlib
+import json
 import logging
+import threading
+import time
+import uuid
 from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import caches
 
 import stripe
 
+from .content_registry import content
+
 logger = logging.getLogger(__name__)
 
+SHARED_CACHE_KEY = 'landing:pricing:snapshots'
+SHARED_LOCK_KEY = 'landing:pricing:refresh-lock'
+
+# The currency the fallback tiers are written in, and so the default snapshot's.
+FALLBACK_CURRENCY = 'usd'
+
+_CURRENCY_SYMBOLS = {'usd': '$', 'eur': '€', 'gbp': '£', 'cad': 'CA$', 'aud': 'A$', 'jpy': '¥'}
+
+# Stripe amounts are in the currency's minor unit, except for these.
+_ZERO_DECIMAL_CURRENCIES = frozenset({
+    'bif', 'clp', 'djf', 'gnf', 'jpy', 'kmf', 'krw', 'mga',
+    'pyg', 'rwf', 'ugx', 'vnd', 'vuv', 'xaf', 'xof', 'xpf',
+})
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PricingAddon:
     id: str
     name: str
@@ -19,12 +44,12 @@ class PricingAddon:
     price_id_annually: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PricingTier:
     id: str
     name: str
     description: str
-    features: list[str]
+    features: tuple[str, ...]
     featured: bool
     cta: str
     price_monthly: int
@@ -32,77 +57,708 @@ class PricingTier:
     is_free: bool = False
     price_id_monthly: str | None = None
     price_id_annually: str | None = None
-    addons: list[PricingAddon] = field(default_factory=list)
+    addons: tuple[PricingAddon, ...] = ()
 
 
-def get_pricing_tiers() -> list[PricingTier]:
+@dataclass(frozen=True, slots=True)
+class PricingSnapshot:
+    """One immutable version of the pricing ladder in one currency, shared
+    as-is by every thread (and, pickled, every worker) that serves it.
+
+    tiers and everything inside them are frozen dataclasses and tuples, so a
+    snapshot can be handed out without copying. fingerprint is a content hash
+    -- identical pricing gives the same fingerprint in every worker and across
+    restarts -- and is all that equality and hashing look at, so downstream
+    caches (ETags, pre-rendered JSON, rendered pages) can key on it directly.
+    last_modified is the Unix time that fingerprint first appeared.
+
+    The snapshot get_pricing_snapshot() returns is in FALLBACK_CURRENCY and
+    carries every other published currency as ready-built alternates, so
+    picking a currency per request (in_currency) is a tuple scan, never a
+    conversion or a Stripe call. Its fingerprint covers the alternates too.
+    """
+    tiers: tuple[PricingTier, ...] = field(compare=False)
+    currency: str = field(compare=False)
+    fingerprint: str
+    last_modified: float = field(compare=False)
+    alternates: tuple['PricingSnapshot', ...] = field(default=(), compare=False)
+
+    @classmethod
+    def build(cls, tiers_by_currency: dict, last_modified: float) -> 'PricingSnapshot':
+        """Snapshot the first currency in tiers_by_currency, with the rest as
+        its alternates."""
+        (currency, tiers), *others = tiers_by_currency.items()
+        alternates = tuple(
+            cls(tuple(t), c, pricing_fingerprint({c: t}), last_modified) for c, t in others
+        )
+        return cls(
+            tuple(tiers), currency, pricing_fingerprint(tiers_by_currency), last_modified, alternates,
+        )
+
+    @property
+    def currencies(self) -> tuple[str, ...]:
+        return (self.currency,) + tuple(s.currency for s in self.alternates)
+
+    @property
+    def symbol(self) -> str:
+        return _CURRENCY_SYMBOLS.get(self.currency, self.currency.upper() + ' ')
+
+    def in_currency(self, currency: str | None) -> 'PricingSnapshot':
+        """The alternate priced in currency, or this snapshot if there is none."""
+        for snapshot in self.alternates:
+            if snapshot.currency == currency:
+                return snapshot
+        return self
+
+
+def get_pricing_tiers() -> tuple[PricingTier, ...]:
     """Single source of truth for pricing tiers, used by both the SSR landing
     page (landing.views.IndexView) and the JSON API (api.views.PricingInfoView).
 
     See PRODUCTION_INCIDENT.md for why this used to be two independently
     hardcoded copies that drifted out of sync.
     """
-    tiers = None
+    return get_pricing_snapshot().tiers
+
+
+def get_pricing_snapshot(currency: str | None = None) -> PricingSnapshot:
+    """The current PricingSnapshot in currency if it is published, otherwise
+    in FALLBACK_CURRENCY; get_pricing_tiers() is the latter's tiers."""
+    snapshot = None
     if settings.BILLING_ENABLED and settings.STRIPE_API_KEY:
-        tiers = _fetch_from_stripe()
-    return tiers or _fallback_tiers()
+        snapshot = pricing_cache.get()
+    return (snapshot or _fallback_snapshot()).in_currency(currency)
+
 
+async def aget_pricing_snapshot(currency: str | None = None) -> PricingSnapshot:
+    """get_pricing_snapshot() for async views. Only a cold or expired cache
+    can block (on the shared tier or Stripe), so only then is the call moved
+    off the event loop; the common in-memory hit stays inline."""
+    if not (settings.BILLING_ENABLED and settings.STRIPE_API_KEY) or pricing_cache.is_warm():
+        return get_pricing_snapshot(currency)
+    return await sync_to_async(get_pricing_snapshot, thread_sensitive=False)(currency)
 
-def tiers_as_dicts(tiers: list[PricingTier]) -> list[dict]:
+
+def published_currencies() -> list[str]:
+    """The currencies pricing is published in, FALLBACK_CURRENCY first: just
+    that one unless PRICING_MULTI_CURRENCY is on, else every one of
+    PRICING_CURRENCIES that Stripe can price in full."""
+    if not settings.PRICING_MULTI_CURRENCY:
+        return [FALLBACK_CURRENCY]
+    return [FALLBACK_CURRENCY] + [c for c in settings.PRICING_CURRENCIES if c != FALLBACK_CURRENCY]
+
+
+def varies_by_currency() -> bool:
+    """Whether responses depend on the currency cookie (and so need Vary: Cookie)."""
+    return len(published_currencies()) > 1
+
+
+def negotiate_currency(request) -> str | None:
+    """The pricing currency a request asks for: a ?currency= query parameter,
+    else the PRICING_CURRENCY_COOKIE cookie. Anything not in
+    published_currencies() is ignored, so None means the default."""
+    if not varies_by_currency():
+        return None
+    for value in (request.GET.get('currency'), request.COOKIES.get(settings.PRICING_CURRENCY_COOKIE)):
+        if value and value.lower() in settings.PRICING_CURRENCIES:
+            return value.lower()
+    return None
+
+
+def tiers_as_dicts(tiers) -> list[dict]:
     return [asdict(t) for t in tiers]
 
 
-def _fetch_from_stripe() -> list[PricingTier] | None:
+def pricing_payload(snapshot) -> dict:
+    """What /api/pricing/ returns for a snapshot, and what the landing page
+    embeds for the monthly/annual toggle: every tier with both prices."""
+    return {
+        'tiers': tiers_as_dicts(snapshot.tiers),
+        'currency': snapshot.currency.upper(),
+        'currency_symbol': snapshot.symbol,
+    }
+
+
+def pricing_fingerprint(tiers_by_currency: dict) -> str:
+    payload = json.dumps(
+        {currency: tiers_as_dicts(tiers) for currency, tiers in tiers_by_currency.items()},
+        sort_keys=True, separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+class PricingCache:
+    """In-process stale-while-revalidate cache in front of the shared tier
+    (_load_shared), which in turn sits in front of _fetch_from_stripe().
+
+    Holds a PricingSnapshot. Within PRICING_CACHE_TTL seconds of a successful
+    fetch, tiers are served
+    straight from memory. For a further PRICING_CACHE_STALE_TTL seconds the
+    last good tiers are still served, but the first request to see them stale
+    starts a single background refresh; everyone else keeps getting the stale
+    copy until it lands. Past that window (or on a cold cache) the request
+    fetches synchronously, and concurrent misses in the same process share
+    one fetch rather than each calling Stripe.
+
+    A failed fetch never replaces good tiers -- the previous list keeps being
+    served and the next request past the TTL tries again.
+
+    While a PricingRefresher is running (refresher_active), requests never
+    load anything themselves: they get whatever the refresher last stored,
+    however old, or None so the caller falls back.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._thread = None
+        self.refresher_active = False
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._pricing = None
+            self._fetched_at = 0.0
+            self._refreshing = False
+            self.hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+            self.refreshes = 0
+            self.refresh_failures = 0
+
+    def get(self) -> PricingSnapshot | None:
+        ttl = settings.PRICING_CACHE_TTL
+        stale_ttl = settings.PRICING_CACHE_STALE_TTL
+        with self._lock:
+            pricing = self._pricing
+            age = time.monotonic() - self._fetched_at
+            if pricing is not None and age < ttl:
+                self.hits += 1
+                return pricing
+            if self.refresher_active:
+                if pricing is None:
+                    self.misses += 1
+                else:
+                    self.stale_hits += 1
+                return pricing
+            if pricing is not None and age < ttl + stale_ttl:
+                self.stale_hits += 1
+                start_refresh = not self._refreshing
+                self._refreshing = True
+            else:
+                self.misses += 1
+                pricing = None
+
+        if pricing is None:
+            return self._load(min_fetched_at=time.monotonic() - ttl)
+        if start_refresh:
+            self._thread = threading.Thread(
+                target=self._refresh_in_background, name='pricing-refresh', daemon=True,
+            )
+            self._thread.start()
+        return pricing
+
+    def is_warm(self) -> bool:
+        """True if get() will answer from memory rather than loading."""
+        with self._lock:
+            if self.refresher_active:
+                return True
+            window = settings.PRICING_CACHE_TTL + settings.PRICING_CACHE_STALE_TTL
+            return self._pricing is not None and time.monotonic() - self._fetched_at < window
+
+    def set(self, pricing: PricingSnapshot):
+        with self._lock:
+            self._pricing = pricing
+            self._fetched_at = time.monotonic()
+            self.refreshes += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'age_seconds': (
+                    round(time.monotonic() - self._fetched_at, 3) if self._pricing is not None else None
+                ),
+            }
+
+    def _refresh_in_background(self):
+        try:
+            self._load()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _load(self, min_fetched_at: float | None = None) -> PricingSnapshot | None:
+        with self._load_lock:
+            # Another thread may have refreshed while we waited for the lock.
+            if min_fetched_at is not None and self._pricing is not None \
+                    and self._fetched_at > min_fetched_at:
+                return self._pricing
+
+            pricing = self._loader()
+            with self._lock:
+                if pricing:
+                    self._pricing = pricing
+                    self._fetched_at = time.monotonic()
+                    self.refreshes += 1
+                else:
+                    self.refresh_failures += 1
+                return self._pricing
+
+
+# Product metadata each Stripe-backed tier/add-on is matched on (confirmed
+# conventions -- see PRODUCTION_INCIDENT.md). Prices whose product matches none
+# of these are dropped by PriceIndex as the search results stream in.
+_INDIVIDUAL_PRODUCT = {'plan': 'regular'}
+_BUSINESS_SEAT_PRODUCT = {'type': 'org_seat', 'tier': 'BUSINESS'}
+_BUSINESS_DOC_BLOCK_PRODUCT = {'type': 'org_doc_block', 'tier': 'BUSINESS'}
+_STRIPE_PRODUCTS = (_INDIVIDUAL_PRODUCT, _BUSINESS_SEAT_PRODUCT, _BUSINESS_DOC_BLOCK_PRODUCT)
+
+_STRIPE_PAGE_SIZE = 100
+
+
+class CircuitBreaker:
+    """Stops calling Stripe after repeated failures.
+
+    After PRICING_BREAKER_FAILURE_THRESHOLD consecutive failures the breaker
+    opens and allow() refuses every call for PRICING_BREAKER_RESET_TIMEOUT
+    seconds. The first call after that is let through alone as a half-open
+    probe: success closes the breaker, failure opens it for another round.
+    Every state change is logged and counted in stats().
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = 0.0
+            self.transitions = {self.OPEN: 0, self.HALF_OPEN: 0, self.CLOSED: 0}
+            self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being refused outright (no probe due yet)."""
+        with self._lock:
+            return self.state == self.OPEN and not self._probe_due()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._probe_due():
+                self._transition(self.HALF_OPEN)
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED
+                and self.failures >= settings.PRICING_BREAKER_FAILURE_THRESHOLD
+            ):
+                self.opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'rejected': self.rejected,
+                'transitions': dict(self.transitions),
+            }
+
+    def _probe_due(self) -> bool:
+        return time.monotonic() - self.opened_at >= settings.PRICING_BREAKER_RESET_TIMEOUT
+
+    def _transition(self, state: str):
+        log = logger.warning if state == self.OPEN else logger.info
+        log('[pricing] %s circuit breaker %s -> %s', self.name, self.state, state)
+        self.state = state
+        self.transitions[state] += 1
+
+
+stripe_breaker = CircuitBreaker('stripe')
+
+
+class StripeDeadlineExceeded(Exception):
+    pass
+
+
+def _fetch_from_stripe() -> dict[str, tuple[PricingTier, ...]] | None:
+    """Tiers for every one of published_currencies() that Stripe can price
+    in full, FALLBACK_CURRENCY first (and always present), or None if Stripe
+    couldn't be read."""
+    if not stripe_breaker.allow():
+        return None
+
     stripe.api_key = settings.STRIPE_API_KEY
+    stripe.api_base = settings.STRIPE_API_BASE or stripe.DEFAULT_API_BASE
+    # Fail fast and let the breaker decide about retrying, rather than the SDK
+    # retrying behind a request for up to its default 80s timeout.
+    stripe.default_http_client = _stripe_http_client(settings.PRICING_STRIPE_TIMEOUT)
+    stripe.max_network_retries = 0
     try:
-        # Search API (not List) to match app-hubsign's exact query convention.
-        # Unlike List, Search is index-backed and can lag ~30-60s after a
-        # Price/Product is created or edited in the Stripe dashboard -- not an
-        # issue in steady state, but worth knowing during initial setup/testing.
-        result = stripe.Price.search(
-            query="active:'true' type:'recurring'",
-            expand=['data.product'],
-            limit=100,
+        index = PriceIndex(
+            _STRIPE_PRODUCTS,
+            _iter_stripe_prices(deadline=time.monotonic() + settings.PRICING_STRIPE_DEADLINE),
         )
     except Exception as exc:
+        stripe_breaker.record_failure()
         logger.error('[pricing] Stripe Price.search failed, using fallback for all tiers: %s', exc)
         return None
+    stripe_breaker.record_success()
 
-    candidates = []
-    for price in result.data:
-        d = price.to_dict()
-        product = d.get('product')
-        if isinstance(product, dict) and product.get('active'):
-            candidates.append(d)
+    tiers_by_currency = {}
+    for currency in published_currencies():
+        tiers = _tiers_in_currency(index, currency)
+        if tiers:
+            tiers_by_currency[currency] = tiers
+    return tiers_by_currency
 
-    def matches(**meta):
-        return [
-            p for p in candidates
-            if all((p['product'].get('metadata') or {}).get(k) == v for k, v in meta.items())
-        ]
 
-    fallback = {t.id: t for t in _fallback_tiers()}
+# TODO(pricing): Team and Enterprise (Shared) aren't wired to Stripe yet -- no
+# confirmed metadata.plan/metadata.type convention exists for them (unlike
+# personal/individual/business, which were confirmed the hard way -- see
+# PRODUCTION_INCIDENT.md). Always sourced from fallback until Stripe products
+# and metadata are set up for these two tiers -- which also means no currency
+# other than FALLBACK_CURRENCY can be published until then, so leave
+# PRICING_MULTI_CURRENCY off.
+_FALLBACK_ONLY_TIERS = ('team', 'enterprise')
 
-    individual = _apply_price(fallback['individual'], matches(plan='regular'), 'Individual')
 
+def _tiers_in_currency(index: 'PriceIndex', currency: str) -> tuple[PricingTier, ...] | None:
+    """The ladder priced in currency. In FALLBACK_CURRENCY anything Stripe
+    can't price keeps its fallback figure; in any other currency that would
+    mix currencies, so the whole currency is skipped instead (None)."""
+    fallback = {t.id: t for t in _fallback_tiers()}
+    strict = currency != FALLBACK_CURRENCY
+    if strict and _FALLBACK_ONLY_TIERS:
+        logger.info(
+            '[pricing] Not publishing %s pricing: %s %s no Stripe prices',
+            currency.upper(), ', '.join(_FALLBACK_ONLY_TIERS),
+            'has' if len(_FALLBACK_ONLY_TIERS) == 1 else 'have',
+        )
+        return None
+
+    individual = _apply_price(
+        fallback['individual'], index.lookup(_INDIVIDUAL_PRODUCT), 'Individual', currency, strict,
+    )
     business = _apply_price(
-        fallback['business'], matches(type='org_seat', tier='BUSINESS'), 'Business',
+        fallback['business'], index.lookup(_BUSINESS_SEAT_PRODUCT), 'Business', currency, strict,
+    )
+    doc_block = _apply_addon(
+        fallback['business'].addons[0], index.lookup(_BUSINESS_DOC_BLOCK_PRODUCT), currency, strict,
+    )
+    if None in (individual, business, doc_block):
+        logger.info('[pricing] Not publishing %s pricing: not every tier has a %s price',
+                    currency.upper(), currency.upper())
+        return None
+    business = replace(business, addons=(doc_block,))
+    return (fallback['free'], individual, fallback['team'], business, fallback['enterprise'])
+
+
+@functools.lru_cache(maxsize=None)
+def _stripe_http_client(timeout: float):
+    return stripe.RequestsClient(timeout=timeout)
+
+
+def _iter_stripe_prices(deadline: float | None = None):
+    """Yield every active recurring price, product expanded, as a dict --
+    following next_page until Stripe reports no more, with one page held in
+    memory at a time.
+
+    Search API (not List) to match app-hubsign's exact query convention.
+    Unlike List, Search is index-backed and can lag ~30-60s after a
+    Price/Product is created or edited in the Stripe dashboard -- not an
+    issue in steady state, but worth knowing during initial setup/testing.
+    Search can't filter on the *product's* metadata, so that narrowing
+    happens in PriceIndex.add() as pages stream through.
+
+    Each price's currency_options (its amounts in other currencies) are
+    expanded too when more than one currency is published.
+
+    Raises StripeDeadlineExceeded rather than start another page once the
+    monotonic deadline has passed.
+    """
+    params = {
+        'query': "active:'true' type:'recurring'",
+        'expand': ['data.product'],
+        'limit': _STRIPE_PAGE_SIZE,
+    }
+    if len(published_currencies()) > 1:
+        params['expand'].append('data.currency_options')
+    while True:
+        result = stripe.Price.search(**params)
+        for price in result.data:
+            yield price.to_dict()
+        if not result.has_more or not result.next_page:
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            raise StripeDeadlineExceeded('pricing fetch ran past PRICING_STRIPE_DEADLINE')
+        params['page'] = result.next_page
+
+
+class PriceIndex:
+    """Stripe prices indexed by product metadata (plan/type/tier) and recurring
+    interval, built in a single pass over the search results.
+
+    Only prices whose product matches one of the given selectors are kept
+    (the first one seen per selector and interval, as a linear scan would
+    pick), so memory stays constant however large the catalog grows, and
+    lookup() is a dict access per interval.
+    """
+
+    def __init__(self, selectors, prices=()):
+        self._shapes = {tuple(sorted(selector)) for selector in selectors}
+        self._wanted = {self._key(selector) for selector in selectors}
+        self._prices = {}
+        for price in prices:
+            self.add(price)
+
+    @staticmethod
+    def _key(selector: dict) -> tuple:
+        shape = tuple(sorted(selector))
+        return shape, tuple(selector[k] for k in shape)
+
+    def add(self, price: dict) -> bool:
+        product = price.get('product')
+        if not (isinstance(product, dict) and product.get('active')):
+            return False
+        metadata = product.get('metadata') or {}
+        interval = price['recurring']['interval']
+        added = False
+        for shape in self._shapes:
+            key = (shape, tuple(metadata.get(k) for k in shape))
+            if key in self._wanted:
+                self._prices.setdefault(key + (interval,), price)
+                added = True
+        return added
+
+    def lookup(self, selector: dict) -> tuple[dict | None, dict | None]:
+        """Return the (monthly, yearly) prices whose product metadata matches selector."""
+        key = self._key(selector)
+        if key not in self._wanted:
+            raise KeyError('PriceIndex was not built for selector {!r}'.format(selector))
+        return self._prices.get(key + ('month',)), self._prices.get(key + ('year',))
+
+
+def _load_shared() -> PricingSnapshot | None:
+    """Second cache tier, shared by every worker on the host through Django's
+    cache framework (PRICING_CACHE_ALIAS -- file-based in production, see
+    DJANGO_CACHE_DIR in settings).
+
+    Only the worker that wins the refresh lock calls Stripe. The others read
+    the previous snapshot if there is one, or on a cold cache wait up to
+    PRICING_REFRESH_WAIT seconds for the winner to publish before giving up
+    and fetching themselves. cache.add() is atomic on locmem, memcached and
+    redis; FileBasedCache checks-then-sets, so in the worst case two workers
+    race and both fetch -- never N.
+    """
+    cache = caches[settings.PRICING_CACHE_ALIAS]
+    entry = cache.get(SHARED_CACHE_KEY)
+    if entry and time.time() - entry['fetched_at'] < settings.PRICING_SHARED_CACHE_TTL:
+        return entry['pricing']
+
+    token = uuid.uuid4().hex
+    if cache.add(SHARED_LOCK_KEY, token, settings.PRICING_REFRESH_LOCK_TIMEOUT):
+        try:
+            tiers_by_currency = _fetch_from_stripe()
+            if tiers_by_currency:
+                return _publish_shared(tiers_by_currency)
+            return entry['pricing'] if entry else None
+        finally:
+            if cache.get(SHARED_LOCK_KEY) == token:
+                cache.delete(SHARED_LOCK_KEY)
+
+    if entry:
+        return entry['pricing']
+    if stripe_breaker.is_open:
+        return None
+
+    deadline = time.monotonic() + settings.PRICING_REFRESH_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(SHARED_CACHE_KEY)
+        if entry:
+            return entry['pricing']
+    logger.warning('[pricing] Timed out waiting for another worker to refresh pricing; fetching directly')
+    tiers_by_currency = _fetch_from_stripe()
+    return _publish_shared(tiers_by_currency) if tiers_by_currency else None
+
+
+def _publish_shared(tiers_by_currency: dict) -> PricingSnapshot:
+    """Snapshot tiers in every currency and publish them to the shared tier.
+    last_modified only moves when the fingerprint changes, so a refresh that
+    finds the same prices doesn't invalidate anyone's conditional GETs."""
+    cache = caches[settings.PRICING_CACHE_ALIAS]
+    now = time.time()
+    pricing = PricingSnapshot.build(tiers_by_currency, now)
+    previous = cache.get(SHARED_CACHE_KEY)
+    if previous and previous['pricing'] == pricing:
+        pricing = previous['pricing']
+    cache.set(
+        SHARED_CACHE_KEY,
+        {'pricing': pricing, 'fetched_at': now},
+        timeout=settings.PRICING_SHARED_CACHE_TTL + settings.PRICING_CACHE_STALE_TTL,
     )
-    business = replace(business, addons=[
-        _apply_addon(business.addons[0], matches(type='org_doc_block', tier='BUSINESS')),
-    ])
+    return pricing
+
+
+def refresh_pricing() -> PricingSnapshot | None:
+    """Rebuild the pricing snapshot from Stripe now, ignoring every TTL, and
+    publish it to the shared tier and this process's cache.
 
-    # TODO(pricing): Team and Enterprise (Shared) aren't wired to Stripe yet -- no
-    # confirmed metadata.plan/metadata.type convention exists for them (unlike
-    # personal/individual/business, which were confirmed the hard way -- see
-    # PRODUCTION_INCIDENT.md). Always sourced from fallback until Stripe products
-    # and metadata are set up for these two tiers.
-    return [fallback['free'], individual, fallback['team'], business, fallback['enterprise']]
+    Called by the Stripe webhook (api.views.StripeWebhookView) on price/product
+    changes. Other workers pick the new snapshot up from the shared tier once
+    their in-process PRICING_CACHE_TTL runs out -- they never call Stripe for it.
+    Returns None (leaving both caches untouched) if billing is off or the
+    fetch failed.
+    """
+    if not (settings.BILLING_ENABLED and settings.STRIPE_API_KEY):
+        return None
+    tiers_by_currency = _fetch_from_stripe()
+    if not tiers_by_currency:
+        return None
+    pricing = _publish_shared(tiers_by_currency)
+    pricing_cache.set(pricing)
+    return pricing
+
+
+def clear_pricing_caches():
+    """Drop both the in-process and the shared pricing tiers."""
+    pricing_cache.clear()
+    caches[settings.PRICING_CACHE_ALIAS].delete(SHARED_CACHE_KEY)
+
+
+class PricingRefresher:
+    """Rebuilds pricing on a fixed interval from a daemon thread, so request
+    threads are served from pricing_cache and never wait on Stripe.
+
+    Started once per worker by landing.startup.warm_up() (see hubsign/wsgi.py),
+    which also runs the first refresh synchronously before the worker accepts
+    traffic. Refreshes go through the shared tier, so with several workers
+    only one of them actually calls Stripe per PRICING_SHARED_CACHE_TTL.
+
+    on_refresh, if set, is called after every successful refresh (from the
+    refresher thread); it is how the static export follows price changes.
+    """
+
+    def __init__(self, cache: PricingCache):
+        self._cache = cache
+        self.on_refresh = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.interval = None
+        self.last_attempt = None
+        self.last_success = None
+        self.last_failure = None
+        self.consecutive_failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh_once(self) -> bool:
+        self.last_attempt = time.time()
+        try:
+            pricing = _load_shared()
+        except Exception:
+            logger.exception('[pricing] Background pricing refresh crashed')
+            pricing = None
+
+        if not pricing:
+            self.last_failure = time.time()
+            self.consecutive_failures += 1
+            return False
+        self._cache.set(pricing)
+        self.last_success = time.time()
+        self.consecutive_failures = 0
+        if self.on_refresh is not None:
+            try:
+                self.on_refresh()
+            except Exception:
+                logger.exception('[pricing] Post-refresh hook failed')
+        return True
+
+    def start(self, interval: float):
+        if self.running:
+            return
+        self.interval = interval
+        self._stop.clear()
+        self._cache.refresher_active = True
+        self._thread = threading.Thread(target=self._run, name='pricing-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+        self._cache.refresher_active = False
+
+    def health(self) -> str:
+        """'degraded' while refreshes are failing or the Stripe breaker is
+        open (pricing is being served stale or from fallback), else 'ok'."""
+        return 'degraded' if self.consecutive_failures or stripe_breaker.is_open else 'ok'
+
+    def status(self) -> dict:
+        return {
+            'running': self.running,
+            'interval_seconds': self.interval,
+            'last_attempt': _isoformat(self.last_attempt),
+            'last_success': _isoformat(self.last_success),
+            'last_failure': _isoformat(self.last_failure),
+            'consecutive_failures': self.consecutive_failures,
+            'cache': self._cache.stats(),
+            'stripe_breaker': stripe_breaker.stats(),
+        }
 
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh_once()
 
-def _apply_price(tier: PricingTier, price_matches: list[dict], label: str) -> PricingTier:
-    monthly, annually, pid_m, pid_a = _resolve_interval_prices(price_matches)
+
+def _isoformat(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+pricing_cache = PricingCache(_load_shared)
+pricing_refresher = PricingRefresher(pricing_cache)
+
+
+def _apply_price(
+    tier: PricingTier, interval_prices: tuple, label: str,
+    currency: str = FALLBACK_CURRENCY, strict: bool = False,
+) -> PricingTier | None:
+    monthly, annually, pid_m, pid_a = _resolve_interval_prices(*interval_prices, currency)
     if monthly is None:
+        if strict:
+            return None
         logger.warning(
             '[pricing] No Stripe Price found for %s; using fallback $%s/mo',
             label, tier.price_monthly,
@@ -114,9 +770,14 @@ def _apply_price(tier: PricingTier, price_matches: list[dict], label: str) -> Pr
     )
 
 
-def _apply_addon(addon: PricingAddon, price_matches: list[dict]) -> PricingAddon:
-    monthly, annually, pid_m, pid_a = _resolve_interval_prices(price_matches)
+def _apply_addon(
+    addon: PricingAddon, interval_prices: tuple,
+    currency: str = FALLBACK_CURRENCY, strict: bool = False,
+) -> PricingAddon | None:
+    monthly, annually, pid_m, pid_a = _resolve_interval_prices(*interval_prices, currency)
     if monthly is None:
+        if strict:
+            return None
         logger.warning(
             '[pricing] No Stripe Price found for add-on %s; using fallback $%s%s',
             addon.id, addon.price_monthly, addon.unit_suffix,
@@ -128,22 +789,43 @@ def _apply_addon(addon: PricingAddon, price_matches: list[dict]) -> PricingAddon
     )
 
 
-def _resolve_interval_prices(price_matches: list[dict]):
-    monthly = next((p for p in price_matches if p['recurring']['interval'] == 'month'), None)
-    yearly = next((p for p in price_matches if p['recurring']['interval'] == 'year'), None)
-    if monthly is None:
+def _resolve_interval_prices(
+    monthly: dict | None, yearly: dict | None, currency: str = FALLBACK_CURRENCY,
+):
+    monthly_amount = _unit_amount(monthly, currency)
+    if monthly_amount is None:
         return None, None, None, None
-    price_monthly = monthly['unit_amount'] // 100
-    price_annually = round(yearly['unit_amount'] / 100 / 12) if yearly else price_monthly
-    return price_monthly, price_annually, monthly['id'], yearly['id'] if yearly else None
+    yearly_amount = _unit_amount(yearly, currency)
+    minor = 1 if currency in _ZERO_DECIMAL_CURRENCIES else 100
+    price_monthly = monthly_amount // minor
+    if yearly_amount is None:
+        return price_monthly, price_monthly, monthly['id'], None
+    return price_monthly, round(yearly_amount / minor / 12), monthly['id'], yearly['id']
+
+
+def _unit_amount(price: dict | None, currency: str) -> int | None:
+    """price's amount in currency: its own unit_amount if that's the price's
+    currency, else the matching (expanded) currency_options entry."""
+    if price is None:
+        return None
+    if price.get('currency', FALLBACK_CURRENCY) == currency:
+        return price['unit_amount']
+    option = (price.get('currency_options') or {}).get(currency)
+    return option.get('unit_amount') if option else None
+
+
+def _fallback_snapshot() -> PricingSnapshot:
+    """The fallback tiers from landing/content/fallback_pricing.json, rebuilt
+    only when that file changes; its mtime is their Last-Modified."""
+    return content.load('fallback_pricing.json', _build_fallback_snapshot)
 
 
-def _fallback_tiers() -> list[PricingTier]:
+def _fallback_tiers() -> tuple[PricingTier, ...]:
     """See HubSign-Pricing-Plan.md Section 2 ("Proposed full ladder", "Feature
     differentiation", "Pricing page layout") and Section 4 ("Annual billing") for
-    where these figures and the card copy rules come from. DMS is included in
-    Business, not sold as a per-seat addon -- that was a live-site bug this ladder
-    fixes, not a simplification made here.
+    where the figures and card copy in fallback_pricing.json come from. DMS is
+    included in Business, not sold as a per-seat addon -- that was a live-site
+    bug this ladder fixes, not a simplification made here.
 
     Card copy follows the doc's "Pricing page layout" rules: allowances first,
     add-on rate last as a muted footnote; user counts shown on every tier; cards
@@ -152,61 +834,16 @@ def _fallback_tiers() -> list[PricingTier]:
     Enterprise is the exception: it renders as a full-width band, not a card, so
     it has room to show DMS/API+embedding inline.
     """
-    return [
-        PricingTier(
-            id='free', name='Free',
-            description='For casual signers.',
-            features=['1 user', '3 signature requests/mo', '30 pages/mo Smart OCR'],
-            featured=False, cta='Get started',
-            price_monthly=0, price_annually=0, is_free=True,
-        ),
-        PricingTier(
-            id='individual', name='Individual',
-            description='For one person signing regularly.',
-            features=['1 user', '15 signature requests/mo', '150 pages/mo Smart OCR', 'API access'],
-            featured=False, cta='Get started',
-            price_monthly=15, price_annually=12,
-        ),
-        PricingTier(
-            id='team', name='Team',
-            description='For small teams that outgrew Individual.',
-            features=['Up to 20 users', '50 signature requests/mo', '400 pages/mo Smart OCR'],
-            featured=True, cta='Get started',
-            price_monthly=59, price_annually=47,
-            addons=[
-                PricingAddon(
-                    id='team_request_block', name='Extra requests',
-                    price_monthly=25, price_annually=21, unit_suffix='/mo per 50 requests',
-                ),
-            ],
-        ),
-        PricingTier(
-            id='business', name='Business',
-            description='Shared workspace for growing teams.',
-            features=['Unlimited users', '150 signature requests/mo', '1,500 pages/mo Smart OCR'],
-            featured=False, cta='Get started',
-            price_monthly=199, price_annually=165,
-            addons=[
-                PricingAddon(
-                    id='doc_block', name='Extra requests',
-                    price_monthly=45, price_annually=37, unit_suffix='/mo per 100 requests',
-                ),
-            ],
-        ),
-        PricingTier(
-            id='enterprise', name='Enterprise',
-            description='High-volume signing on shared infrastructure.',
-            features=[
-                'Unlimited users', '500 signature requests/mo', '5,000 pages/mo Smart OCR',
-                'Document Manager included', 'API + embedding',
-            ],
-            featured=False, cta='Get started',
-            price_monthly=300, price_annually=249,
-            addons=[
-                PricingAddon(
-                    id='enterprise_request_block', name='Extra requests',
-                    price_monthly=35, price_annually=29, unit_suffix='/mo per 250 requests',
-                ),
-            ],
-        ),
-    ]
+    return _fallback_snapshot().tiers
+
+
+def _build_fallback_snapshot(data: dict, mtime: float) -> PricingSnapshot:
+    tiers = tuple(
+        PricingTier(**{
+            **tier,
+            'features': tuple(tier['features']),
+            'addons': tuple(PricingAddon(**addon) for addon in tier.get('addons', ())),
+        })
+        for tier in data['tiers']
+    )
+    return PricingSnapshot.build({FALLBACK_CURRENCY: tiers}, mtime)
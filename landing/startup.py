@@ -0,0 +1,80 @@
+"""Per-worker warm-up, run from hubsign/wsgi.py once the application is loaded
+and before the worker accepts its first request."""
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+
+from .icons import load_icons
+from .pricing import pricing_refresher
+from .static_export import export_if_stale, export_refresher
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    warm_templates()
+    load_icons()
+
+    if settings.BILLING_ENABLED and settings.STRIPE_API_KEY:
+        if pricing_refresher.refresh_once():
+            logger.info('[startup] Pricing prewarmed')
+        else:
+            logger.warning('[startup] Pricing prewarm failed; serving fallback until the next refresh')
+
+    if settings.STATIC_EXPORT_ROOT:
+        # Every worker checks, but only one re-exports per deploy or price
+        # change: the rest wait on the export lock, then find the published
+        # release already current.
+        export_static_site()
+        pricing_refresher.on_refresh = export_static_site
+        if settings.STATIC_EXPORT_CHECK_INTERVAL > 0:
+            export_refresher.start(settings.STATIC_EXPORT_ROOT, settings.STATIC_EXPORT_CHECK_INTERVAL)
+
+    if settings.BILLING_ENABLED and settings.STRIPE_API_KEY and settings.PRICING_REFRESH_INTERVAL > 0:
+        pricing_refresher.start(settings.PRICING_REFRESH_INTERVAL)
+
+
+def export_static_site():
+    try:
+        export_if_stale(settings.STATIC_EXPORT_ROOT)
+    except Exception:
+        logger.exception('[startup] Static export failed; nginx keeps serving the previous release')
+
+
+def warm_templates() -> list[tuple[str, float]]:
+    """Compile every template under the project template DIRS (pages and
+    partials) into the engine's cached loader, so
+    the first request to a fresh worker doesn't pay for parsing them.
+    Returns (template name, compile seconds) pairs in compile order; a
+    template that fails to compile is logged and skipped -- it will fail the
+    same way when a request renders it."""
+    engine = engines['django']
+    timings = []
+    for name in template_names(engine.engine.dirs):
+        started = time.perf_counter()
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError:
+            logger.exception('[startup] Template %s failed to compile', name)
+            continue
+        elapsed = time.perf_counter() - started
+        timings.append((name, elapsed))
+        logger.debug('[startup] Compiled %s in %.2f ms', name, elapsed * 1000)
+
+    logger.info('[startup] Compiled %d templates in %.1f ms',
+                len(timings), sum(elapsed for _, elapsed in timings) * 1000)
+    return timings
+
+
+def template_names(dirs) -> list[str]:
+    """Loader names (paths relative to their template dir) of every file in dirs."""
+    names = []
+    for template_dir in dirs:
+        for root, _, files in sorted(os.walk(template_dir)):
+            for filename in sorted(files):
+                path = os.path.relpath(os.path.join(root, filename), template_dir)
+                names.append(path.replace(os.sep, '/'))
+    return names
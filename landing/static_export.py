@@ -0,0 +1,209 @@
+"""Pre-rendered export of the landing page and the default /api/pricing/ body,
+for nginx to serve as plain files (see nginx/nginx.conf).
+
+Each export is rendered into a fresh directory under <root>/releases/ and
+published by pointing the <root>/current symlink at it with a single
+rename(), so nginx only ever sees a complete release. The symlink target is
+relative, so the same volume works wherever it is mounted.
+
+An export covers the default currency for anonymous visitors; requests
+with ?currency=, a currency cookie or a session still go to Django. It
+carries no CSRF token: anonymous API POSTs are not CSRF-checked (DRF's
+SessionAuthentication only enforces it for logged-in sessions).
+
+export_if_stale() re-exports when the pricing fingerprint, the templates,
+static files or landing copy, or the footer year have moved since the
+published release. When STATIC_EXPORT_ROOT is set, landing.startup runs it
+at boot (a deploy), after each background pricing refresh, and every
+STATIC_EXPORT_CHECK_INTERVAL seconds from export_refresher -- the only
+trigger for copy edits and the new year, and for pricing with billing off.
+Exports hold <root>/.lock, so of the workers that find the release stale
+only the first re-exports; the rest find it current once they get the lock.
+"""
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.test import RequestFactory
+
+from api.views import pricing_json_body
+
+from .content_registry import content_version
+from .page_cache import static_version, template_version
+from .pricing import get_pricing_snapshot
+from .views import IndexView
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+LOCK_FILE = '.lock'
+PAGES = {
+    'index.html': IndexView,
+}
+PRICING_JSON = 'api/pricing.json'
+KEEP_RELEASES = 3
+
+_last_exported = {}
+
+
+def export_key(snapshot) -> dict:
+    """What an export depends on; a release is stale once any of it moves."""
+    return {
+        'pricing': snapshot.fingerprint,
+        'templates': template_version(),
+        'static': static_version(),
+        'content': content_version(),
+        'year': time.localtime().tm_year,
+    }
+
+
+def published_key(root) -> dict | None:
+    try:
+        return json.loads((Path(root) / 'current' / MANIFEST).read_text())['key']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def export_if_stale(root) -> Path | None:
+    """Export to root unless the published release is already current.
+    Returns the new release directory, or None if nothing was exported."""
+    snapshot = get_pricing_snapshot()
+    key = export_key(snapshot)
+    if _last_exported.get(root) == key:
+        return None
+    with exclusive(root):
+        # Another worker may have published while this one waited.
+        if published_key(root) == key:
+            _last_exported[root] = key
+            return None
+        release = _export(Path(root), snapshot)
+        _last_exported[root] = key
+        return release
+
+
+def export_site(root, snapshot=None) -> Path:
+    """Render every exported file into a new release under root, publish it
+    as root/current and prune old releases. Returns the release directory."""
+    with exclusive(root):
+        return _export(Path(root), snapshot or get_pricing_snapshot())
+
+
+@contextlib.contextmanager
+def exclusive(root):
+    """Hold root/.lock, shared by every process and thread exporting to root:
+    gunicorn's workers each check at boot, and one worker's prune() must not
+    remove a release another is about to publish."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / LOCK_FILE, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _export(root: Path, snapshot) -> Path:
+    releases = root / 'releases'
+    releases.mkdir(parents=True, exist_ok=True)
+    release = Path(tempfile.mkdtemp(prefix=time.strftime('%Y%m%dT%H%M%S-'), dir=releases))
+    # mkdtemp creates 0700; nginx runs as another user.
+    release.chmod(0o755)
+
+    started = time.perf_counter()
+    files = {name: render_page(view_class, snapshot) for name, view_class in PAGES.items()}
+    files[PRICING_JSON] = pricing_json_body(snapshot)
+    files[MANIFEST] = json.dumps({
+        'key': export_key(snapshot),
+        'currency': snapshot.currency,
+        'exported_at': time.time(),
+        'files': sorted(files),
+    }, indent=2).encode()
+
+    for name, body in files.items():
+        path = release / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+
+    publish(root, release)
+    prune(releases, keep=release)
+    logger.info('[export] Published %s (%d files, pricing %s) in %.1f ms',
+                release.name, len(files), snapshot.fingerprint[:12], (time.perf_counter() - started) * 1000)
+    return release
+
+
+def render_page(view_class, snapshot) -> bytes:
+    request = RequestFactory().get('/', secure=True)
+    view = view_class()
+    view.setup(request)
+    response = view.render_pricing_page(snapshot, csrf_token='')
+    return response.render().content
+
+
+def publish(root: Path, release: Path):
+    """Atomically point root/current at release."""
+    link = root / 'current'
+    tmp_link = root / '.current.{}'.format(os.getpid())
+    if tmp_link.is_symlink():
+        tmp_link.unlink()
+    tmp_link.symlink_to(release.relative_to(root), target_is_directory=True)
+    os.replace(tmp_link, link)
+
+
+def prune(releases: Path, keep: Path):
+    """Drop all but the KEEP_RELEASES newest releases. The one just published
+    is always kept, and so is whatever current points at (nginx may still be
+    reading it)."""
+    current = (releases.parent / 'current').resolve()
+    candidates = sorted(releases.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+    for release in candidates[KEEP_RELEASES:]:
+        if release.resolve() not in (keep.resolve(), current):
+            shutil.rmtree(release, ignore_errors=True)
+
+
+class ExportRefresher:
+    """Runs export_if_stale(root) every interval seconds from a daemon
+    thread. Each check is a few stats and a dict comparison unless something
+    actually moved."""
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+        self.root = None
+        self.interval = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, root, interval: float):
+        if self.running:
+            return
+        self.root = root
+        self.interval = interval
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='static-export', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                export_if_stale(self.root)
+            except Exception:
+                logger.exception('[export] Periodic export failed; nginx keeps serving the previous release')
+
+
+export_refresher = ExportRefresher()
@@ -0,0 +1,73 @@
+import json
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedStaticFilesStorage
+
+from .images import IMAGE_MANIFEST, image_size, optimize, responsive_variants, variant_width
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizedStaticFilesStorage(CompressedStaticFilesStorage):
+    """whitenoise's compressing storage, optimizing images first (see
+    landing.images): the project's SVGs and PNGs are replaced by their optimized
+    versions, the RESPONSIVE_IMAGES get their size variants, and the result
+    -- variants and per-file byte savings -- is written to IMAGE_MANIFEST.
+    Everything, variants included, is then compressed as before."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        paths = dict(paths)
+        manifest = {'images': {}, 'savings': {}}
+
+        for name in sorted(paths):
+            if not name.endswith(('.svg', '.png')) or not self._is_project_file(*paths[name]):
+                continue
+            with self.open(name) as f:
+                data = f.read()
+            optimized = optimize(name, data)
+            if optimized is not data:
+                self._replace(name, optimized)
+                yield name, name, True
+            manifest['savings'][name] = {'original': len(data), 'optimized': len(optimized)}
+            logger.info('[images] %s: %d -> %d bytes', name, len(data), len(optimized))
+
+            display_height = settings.RESPONSIVE_IMAGES.get(name)
+            if display_height:
+                manifest['images'][name] = self._write_variants(name, optimized, display_height, paths)
+
+        self._replace(IMAGE_MANIFEST, json.dumps(manifest, indent=2).encode())
+        paths[IMAGE_MANIFEST] = (self, IMAGE_MANIFEST)
+        yield from super().post_process(paths, dry_run, **options)
+
+    @staticmethod
+    def _is_project_file(source_storage, source_path) -> bool:
+        """Whether a collected file came from STATICFILES_DIRS rather than an
+        app (admin, DRF...): only our own images are known to survive the
+        optimizer unchanged in appearance."""
+        location = getattr(source_storage, 'location', None)
+        return location is not None and any(
+            Path(location).resolve() == Path(static_dir).resolve() for static_dir in settings.STATICFILES_DIRS
+        )
+
+    def _write_variants(self, name, data, display_height, paths) -> dict:
+        width, height = image_size(data)
+        variants = responsive_variants(name, data, display_height)
+        for variant, body in variants.items():
+            self._replace(variant, body)
+            paths[variant] = (self, variant)
+        return {
+            'width': round(width * display_height / height),
+            'height': display_height,
+            'png': sorted([variant_width(v, width), v] for v in [name, *variants] if v.endswith('.png')),
+            'webp': sorted([variant_width(v, width), v] for v in variants if v.endswith('.webp')),
+        }
+
+    def _replace(self, name, data: bytes):
+        if self.exists(name):
+            self.delete(name)
+        self.save(name, ContentFile(data))
@@ -0,0 +1,183 @@
+"""A local stand-in for the slice of the Stripe API that landing.pricing uses
+(GET /v1/prices/search), for load and tail-latency tests that must not touch
+live Stripe.
+
+It replays a recorded catalog -- by default fixtures/stripe/price_search.json,
+or one captured from a real account with `manage.py stripe_standin --record`
+-- optionally padded with synthetic prices to any size, and pages through it
+the way Stripe does (limit / page / has_more / next_page). Every response can
+be delayed and a share of them failed, to see how the pricing cache, deadline
+and circuit breaker behave against a slow or flaky upstream. Point the app at
+it with STRIPE_API_BASE.
+
+The search query itself isn't interpreted: the catalog is taken to be the
+recorded result of the query landing.pricing sends.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+RECORDED_CATALOG = Path(__file__).resolve().parent / 'fixtures' / 'stripe' / 'price_search.json'
+
+SEARCH_PATH = '/v1/prices/search'
+
+
+def load_catalog(path=RECORDED_CATALOG) -> list[dict]:
+    """Prices from a recorded search result (or a bare list of prices)."""
+    recorded = json.loads(Path(path).read_text())
+    return recorded['data'] if isinstance(recorded, dict) else recorded
+
+
+def synthetic_prices(count: int, seed: int = 0) -> list[dict]:
+    """count active monthly/yearly price pairs for products with realistic
+    plan/type/tier metadata noise -- none of them on a product landing.pricing
+    is wired to."""
+    rng = random.Random(seed)
+    plans = ['legacy', 'starter', 'pro', 'agency', None]
+    types = ['org_seat', 'org_doc_block', 'org_storage', None]
+    tiers = ['TEAM', 'ENTERPRISE', 'STARTER', None]
+
+    prices = []
+    while len(prices) < count:
+        metadata = {
+            'plan': rng.choice(plans), 'type': rng.choice(types), 'tier': rng.choice(tiers),
+        }
+        product = {
+            'id': 'prod_synth{:06d}'.format(len(prices)),
+            'object': 'product',
+            'active': True,
+            'metadata': {k: v for k, v in metadata.items() if v is not None},
+        }
+        amount = rng.randrange(500, 50000, 100)
+        for interval, unit_amount in (('month', amount), ('year', amount * 10)):
+            prices.append({
+                'id': 'price_synth{:06d}'.format(len(prices)),
+                'object': 'price',
+                'active': True,
+                'currency': 'usd',
+                'type': 'recurring',
+                'unit_amount': unit_amount,
+                'recurring': {'interval': interval},
+                'product': product,
+            })
+    return prices[:count]
+
+
+class StripeStandin:
+    """Serves prices over HTTP as Stripe's Price.search would.
+
+    latency and jitter are in seconds: each response waits latency plus a
+    uniform 0..jitter. error_rate of responses (0..1) get error_status with a
+    Stripe-shaped error body instead. requests and errors count what was
+    served.
+    """
+
+    def __init__(self, prices, latency=0.0, jitter=0.0, error_rate=0.0, error_status=500, seed=None):
+        self.prices = list(prices)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self, host='127.0.0.1', port=0) -> str:
+        """Start serving from a daemon thread (port 0 picks a free one) and
+        return the api_base."""
+        self._bind(host, port)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+            name='stripe-standin', daemon=True,
+        )
+        self._thread.start()
+        return self.api_base
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def serve_forever(self, host='127.0.0.1', port=0):
+        """Serve from the calling thread until interrupted."""
+        self._bind(host, port)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def _bind(self, host, port):
+        self._server = ThreadingHTTPServer((host, port), _StandinHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+
+    def respond(self, path: str, query: dict) -> tuple[int, dict]:
+        """The (status, body) Stripe would send for a GET, after the
+        configured delay."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+
+        if path != SEARCH_PATH:
+            return 404, _error('invalid_request_error', 'Unrecognized request URL (GET: {})'.format(path))
+        if fail:
+            return self.error_status, _error('api_error', 'Injected failure from the Stripe stand-in')
+        return 200, self.search_page(query)
+
+    def search_page(self, query: dict) -> dict:
+        limit = min(max(int(query.get('limit', 10)), 1), 100)
+        start = int(query.get('page') or 0)
+        end = start + limit
+        has_more = end < len(self.prices)
+        return {
+            'object': 'search_result',
+            'data': self.prices[start:end],
+            'has_more': has_more,
+            'next_page': str(end) if has_more else None,
+            'url': SEARCH_PATH,
+        }
+
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        status, body = self.server.standin.respond(url.path, query)
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Request-Id', 'req_standin{:08d}'.format(self.server.standin.requests))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug('[stripe-standin] ' + format, *args)
+
+
+def _error(error_type: str, message: str) -> dict:
+    return {'error': {'type': error_type, 'message': message}}
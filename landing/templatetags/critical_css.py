@@ -0,0 +1,12 @@
+from django import template
+
+from landing.critical_css import critical_css_for
+
+register = template.Library()
+
+
+@register.simple_tag
+def critical_css(template_name):
+    """The built critical CSS for template_name (see landing.critical_css),
+    or '' if it hasn't been built for the current main.css."""
+    return critical_css_for(template_name)
@@ -0,0 +1,11 @@
+from django import template
+
+from landing.icons import icon_svg
+
+register = template.Library()
+
+
+@register.simple_tag
+def icon(name):
+    """Inline SVG for a templates/components/icons/ icon, e.g. {% icon "lock" %}."""
+    return icon_svg(name)
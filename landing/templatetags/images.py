@@ -0,0 +1,31 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from landing.images import image_manifest
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(name, alt='', **attrs):
+    """{% static %} for a RESPONSIVE_IMAGES image, as a <picture> with WebP
+    and PNG srcsets sized for how the stylesheet displays it, e.g.
+    {% picture "images/hubsign_logo.png" alt="HubSign" class="footer-logo" %}.
+    Without collected variants (DEBUG, no Pillow) it is a plain <img>."""
+    entry = image_manifest().get('images', {}).get(name)
+    extra = format_html_join('', ' {}="{}"', sorted(attrs.items()))
+    if not entry or not entry['webp']:
+        return format_html('<img src="{}" alt="{}"{}>', static(name), alt, extra)
+
+    sizes = '{}px'.format(entry['width'])
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}"{}></picture>',
+        _srcset(entry['webp']), sizes,
+        static(name), _srcset(entry['png']), sizes, entry['width'], entry['height'], alt, extra,
+    )
+
+
+def _srcset(variants) -> str:
+    return ', '.join('{} {}w'.format(static(variant), width) for width, variant in variants)
@@ -1,8 +1,38 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zlib
+from dataclasses import replace
+from pathlib import Path
 from unittest.mock import patch
 
-from django.test import TestCase, override_settings
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.template import Context, Template, engines
+from django.test import Client, RequestFactory, TestCase, override_settings
 
-from .pricing import get_pricing_tiers
+from . import critical_css
+from .content_registry import content, content_version, get_features
+from .icons import icon_svg, load_icons
+from .images import IMAGE_MANIFEST, _png_chunks, minify_svg, optimize_png
+from .middleware import _logo_link, preload_links
+from .page_cache import CSRF_PLACEHOLDER, rendered_pages
+from .pricing import (
+    SHARED_LOCK_KEY, CircuitBreaker, PriceIndex, PricingCache, PricingRefresher, PricingSnapshot,
+    _fallback_snapshot, _load_shared, aget_pricing_snapshot, clear_pricing_caches,
+    get_pricing_snapshot, get_pricing_tiers, negotiate_currency, pricing_cache, refresh_pricing,
+    stripe_breaker,
+)
+from .startup import warm_templates
+from .static_export import ExportRefresher, export_if_stale, export_site
+from .storage import OptimizedStaticFilesStorage
+from .stripe_standin import StripeStandin, load_catalog, synthetic_prices
 
 
 class FakePrice:
@@ -14,19 +44,41 @@ class FakePrice:
 
 
 class FakeSearchResult:
-    def __init__(self, data):
+    def __init__(self, data, next_page=None):
         self.data = data
+        self.has_more = next_page is not None
+        self.next_page = next_page
+
+
+def reset_pricing_state():
+    clear_pricing_caches()
+    stripe_breaker.reset()
 
 
 def fake_price(unit_amount, interval, price_id, **metadata):
     return FakePrice({
         'id': price_id,
         'unit_amount': unit_amount,
+        'currency': 'usd',
         'recurring': {'interval': interval},
         'product': {'active': True, 'metadata': metadata},
     })
 
 
+def raised_fallback_snapshot():
+    """The fallback snapshot with every tier $1/mo dearer (Business: $200)."""
+    current = _fallback_snapshot()
+    raised = [replace(t, price_monthly=t.price_monthly + 1) for t in current.tiers]
+    return PricingSnapshot.build({'usd': raised}, current.last_modified)
+
+
+def with_currency_options(price, **unit_amounts):
+    price._d['currency_options'] = {
+        currency: {'unit_amount': amount} for currency, amount in unit_amounts.items()
+    }
+    return price
+
+
 class PricingFallbackTests(TestCase):
     """BILLING_ENABLED is False by default (no STRIPE_API_KEY in test settings),
     so get_pricing_tiers() should always return the hardcoded fallback here."""
@@ -61,9 +113,24 @@ class PricingFallbackTests(TestCase):
         self.assertEqual(enterprise.addons[0].price_monthly, 35)
         self.assertEqual(enterprise.addons[0].unit_suffix, '/mo per 250 requests')
 
+    def test_snapshot_is_immutable_and_compared_by_fingerprint(self):
+        snapshot = get_pricing_snapshot()
+        self.assertIs(get_pricing_tiers(), snapshot.tiers)
+        self.assertIsInstance(snapshot.tiers[0].features, tuple)
+        with self.assertRaises(AttributeError):
+            snapshot.tiers[0].price_monthly = 1
+        self.assertFalse(hasattr(snapshot.tiers[0], '__dict__'))
+
+        rebuilt = PricingSnapshot.build({'usd': list(snapshot.tiers)}, last_modified=0)
+        self.assertEqual(rebuilt, snapshot)
+        self.assertEqual(hash(rebuilt), hash(snapshot))
+
 
 @override_settings(BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake')
 class PricingStripeTests(TestCase):
+    def setUp(self):
+        reset_pricing_state()
+
     @patch('landing.pricing.stripe.Price.search')
     def test_stripe_prices_override_fallback(self, mock_search):
         mock_search.return_value = FakeSearchResult([
@@ -112,6 +179,40 @@ class PricingStripeTests(TestCase):
         self.assertIsNone(doc_block.price_id_monthly)
         self.assertTrue(any('doc_block' in message for message in logs.output))
 
+    @patch('landing.pricing.stripe.Price.search')
+    def test_follows_next_page_until_exhausted(self, mock_search):
+        mock_search.side_effect = [
+            FakeSearchResult([
+                fake_price(1500, 'month', 'price_ind_m', plan='regular'),
+                fake_price(900, 'month', 'price_other', plan='legacy'),
+            ], next_page='page_2'),
+            FakeSearchResult([
+                fake_price(19900, 'month', 'price_biz_m', type='org_seat', tier='BUSINESS'),
+            ]),
+        ]
+
+        tiers = get_pricing_tiers()
+
+        self.assertEqual(tiers[1].price_id_monthly, 'price_ind_m')
+        self.assertEqual(tiers[3].price_id_monthly, 'price_biz_m')
+        self.assertEqual(mock_search.call_count, 2)
+        self.assertNotIn('page', mock_search.call_args_list[0].kwargs)
+        self.assertEqual(mock_search.call_args_list[1].kwargs['page'], 'page_2')
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_failure_on_later_page_falls_back_entirely(self, mock_search):
+        mock_search.side_effect = [
+            FakeSearchResult([
+                fake_price(1500, 'month', 'price_ind_m', plan='regular'),
+            ], next_page='page_2'),
+            Exception('stripe is down'),
+        ]
+
+        with self.assertLogs('landing.pricing', level='ERROR'):
+            tiers = get_pricing_tiers()
+
+        self.assertIsNone(tiers[1].price_id_monthly)
+
     @patch('landing.pricing.stripe.Price.search')
     def test_stripe_search_exception_falls_back_entirely(self, mock_search):
         mock_search.side_effect = Exception('stripe is down')
@@ -126,6 +227,387 @@ class PricingStripeTests(TestCase):
         self.assertIsNone(tiers[1].price_id_monthly)
 
 
+@override_settings(
+    BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake',
+    PRICING_MULTI_CURRENCY=True, PRICING_CURRENCIES=['usd', 'eur', 'jpy'],
+)
+class PricingCurrencyTests(TestCase):
+    def setUp(self):
+        reset_pricing_state()
+
+    def stripe_result(self):
+        return FakeSearchResult([
+            with_currency_options(
+                fake_price(1500, 'month', 'price_ind_m', plan='regular'), eur=1400, jpy=2500,
+            ),
+            with_currency_options(fake_price(14400, 'year', 'price_ind_y', plan='regular'), eur=13200),
+            with_currency_options(
+                fake_price(19900, 'month', 'price_biz_m', type='org_seat', tier='BUSINESS'), eur=18900,
+            ),
+            with_currency_options(
+                fake_price(4500, 'month', 'price_block_m', type='org_doc_block', tier='BUSINESS'), eur=4200,
+            ),
+        ])
+
+    @patch('landing.pricing._FALLBACK_ONLY_TIERS', ())
+    @patch('landing.pricing.stripe.Price.search')
+    def test_each_fully_priced_currency_gets_its_own_snapshot(self, mock_search):
+        mock_search.return_value = self.stripe_result()
+
+        usd = get_pricing_snapshot()
+        eur = get_pricing_snapshot('eur')
+
+        self.assertIn('data.currency_options', mock_search.call_args.kwargs['expand'])
+        self.assertEqual(mock_search.call_count, 1)
+        # JPY only covers Individual, so it isn't published at all.
+        self.assertEqual(usd.currencies, ('usd', 'eur'))
+        self.assertIs(get_pricing_snapshot('jpy'), usd)
+
+        self.assertEqual((eur.currency, eur.symbol), ('eur', '€'))
+        self.assertEqual(eur.tiers[1].price_monthly, 14)
+        self.assertEqual(eur.tiers[1].price_annually, 11)
+        self.assertEqual(eur.tiers[1].price_id_monthly, 'price_ind_m')
+        self.assertEqual(eur.tiers[3].addons[0].price_monthly, 42)
+        self.assertEqual(usd.tiers[1].price_monthly, 15)
+        self.assertNotEqual(eur.fingerprint, usd.fingerprint)
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_currencies_stay_unpublished_while_tiers_are_fallback_only(self, mock_search):
+        mock_search.return_value = self.stripe_result()
+
+        with self.assertLogs('landing.pricing', level='INFO') as logs:
+            snapshot = get_pricing_snapshot('eur')
+
+        self.assertEqual(snapshot.currency, 'usd')
+        self.assertEqual(snapshot.currencies, ('usd',))
+        self.assertTrue(any('Not publishing EUR' in message for message in logs.output))
+
+    @override_settings(PRICING_MULTI_CURRENCY=False)
+    @patch('landing.pricing.stripe.Price.search')
+    def test_only_usd_is_fetched_and_served_while_multi_currency_is_off(self, mock_search):
+        mock_search.return_value = self.stripe_result()
+
+        self.assertEqual(get_pricing_snapshot().currencies, ('usd',))
+        self.assertNotIn('data.currency_options', mock_search.call_args.kwargs['expand'])
+        self.assertIsNone(negotiate_currency(RequestFactory().get('/', {'currency': 'eur'})))
+        self.assertNotIn('Cookie', self.client.get('/api/pricing/').get('Vary', ''))
+
+    def test_query_parameter_beats_cookie_and_unknown_codes_are_ignored(self):
+        factory = RequestFactory()
+        factory.cookies['pricing_currency'] = 'jpy'
+
+        self.assertEqual(negotiate_currency(factory.get('/', {'currency': 'EUR'})), 'eur')
+        self.assertEqual(negotiate_currency(factory.get('/')), 'jpy')
+        self.assertEqual(negotiate_currency(factory.get('/', {'currency': 'xyz'})), 'jpy')
+        self.assertIsNone(negotiate_currency(RequestFactory().get('/', {'currency': 'xyz'})))
+
+
+class PriceIndexTests(TestCase):
+    SELECTORS = ({'plan': 'regular'}, {'type': 'org_seat', 'tier': 'BUSINESS'})
+
+    def test_lookup_by_selector_and_interval(self):
+        seat_m = fake_price(19900, 'month', 'price_biz_m', type='org_seat', tier='BUSINESS').to_dict()
+        seat_y = fake_price(198000, 'year', 'price_biz_y', type='org_seat', tier='BUSINESS').to_dict()
+        regular_m = fake_price(1500, 'month', 'price_ind_m', plan='regular', tier='X').to_dict()
+        other = fake_price(4500, 'month', 'price_team_m', type='org_seat', tier='TEAM').to_dict()
+        index = PriceIndex(self.SELECTORS, [other, seat_m, regular_m, seat_y])
+
+        self.assertEqual(index.lookup({'tier': 'BUSINESS', 'type': 'org_seat'}), (seat_m, seat_y))
+        self.assertEqual(index.lookup({'plan': 'regular'}), (regular_m, None))
+
+    def test_first_price_seen_wins_and_inactive_products_are_skipped(self):
+        inactive = fake_price(900, 'month', 'price_inactive', plan='regular').to_dict()
+        inactive['product']['active'] = False
+        first = fake_price(1500, 'month', 'price_first', plan='regular').to_dict()
+        second = fake_price(1900, 'month', 'price_second', plan='regular').to_dict()
+
+        monthly, _ = PriceIndex(self.SELECTORS, [inactive, first, second]).lookup({'plan': 'regular'})
+
+        self.assertIs(monthly, first)
+
+    def test_lookup_for_unindexed_selector_raises(self):
+        with self.assertRaises(KeyError):
+            PriceIndex(self.SELECTORS).lookup({'type': 'org_doc_block'})
+
+
+@override_settings(BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake')
+class PricingCacheTests(TestCase):
+    def setUp(self):
+        reset_pricing_state()
+
+    def stripe_result(self, unit_amount):
+        return FakeSearchResult([
+            fake_price(unit_amount, 'month', 'price_ind_m', plan='regular'),
+        ])
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_fresh_tiers_are_served_from_memory(self, mock_search):
+        mock_search.return_value = self.stripe_result(1500)
+
+        first = get_pricing_tiers()
+        second = get_pricing_tiers()
+
+        self.assertIs(first, second)
+        mock_search.assert_called_once()
+        stats = pricing_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['refreshes'], 1)
+
+    @override_settings(PRICING_CACHE_TTL=0, PRICING_SHARED_CACHE_TTL=0, PRICING_CACHE_STALE_TTL=60)
+    @patch('landing.pricing.stripe.Price.search')
+    def test_stale_tiers_are_served_while_refreshing_in_background(self, mock_search):
+        mock_search.return_value = self.stripe_result(1500)
+        get_pricing_tiers()
+
+        mock_search.return_value = self.stripe_result(1900)
+        stale = get_pricing_tiers()
+        pricing_cache._thread.join()
+
+        self.assertEqual(stale[1].price_monthly, 15)
+        self.assertEqual(pricing_cache.stats()['stale_hits'], 1)
+        self.assertEqual(pricing_cache.stats()['refreshes'], 2)
+
+        with override_settings(PRICING_CACHE_TTL=60):
+            self.assertEqual(get_pricing_tiers()[1].price_monthly, 19)
+
+    @override_settings(PRICING_CACHE_TTL=0, PRICING_SHARED_CACHE_TTL=0, PRICING_CACHE_STALE_TTL=0)
+    @patch('landing.pricing.stripe.Price.search')
+    def test_failed_refresh_keeps_last_good_tiers(self, mock_search):
+        mock_search.return_value = self.stripe_result(1900)
+        get_pricing_tiers()
+
+        mock_search.side_effect = Exception('stripe is down')
+        with self.assertLogs('landing.pricing', level='ERROR'):
+            tiers = get_pricing_tiers()
+
+        self.assertEqual(tiers[1].price_monthly, 19)
+        self.assertEqual(tiers[1].price_id_monthly, 'price_ind_m')
+        self.assertEqual(pricing_cache.stats()['refresh_failures'], 1)
+
+    @patch('landing.pricing.sync_to_async', wraps=sync_to_async)
+    @patch('landing.pricing.stripe.Price.search')
+    async def test_async_callers_only_leave_the_event_loop_on_a_cold_cache(
+        self, mock_search, mock_offload,
+    ):
+        mock_search.return_value = self.stripe_result(1900)
+
+        cold = await aget_pricing_snapshot()
+        self.assertEqual(mock_offload.call_count, 1)
+
+        warm = await aget_pricing_snapshot()
+        self.assertEqual(mock_offload.call_count, 1)
+        self.assertIs(warm, cold)
+        self.assertEqual(warm.tiers[1].price_monthly, 19)
+
+
+@override_settings(BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake', PRICING_REFRESH_WAIT=0)
+class SharedPricingCacheTests(TestCase):
+    """Each PricingCache instance stands in for a separate gunicorn worker."""
+
+    def setUp(self):
+        reset_pricing_state()
+        self.addCleanup(cache.delete, SHARED_LOCK_KEY)
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_second_worker_reads_snapshot_published_by_first(self, mock_search):
+        mock_search.return_value = FakeSearchResult([
+            fake_price(1500, 'month', 'price_ind_m', plan='regular'),
+        ])
+
+        PricingCache(_load_shared).get()
+        tiers = PricingCache(_load_shared).get().tiers
+
+        mock_search.assert_called_once()
+        self.assertEqual(tiers[1].price_id_monthly, 'price_ind_m')
+
+    @override_settings(PRICING_CACHE_TTL=0, PRICING_SHARED_CACHE_TTL=0)
+    @patch('landing.pricing.stripe.Price.search')
+    def test_worker_reads_previous_snapshot_while_another_refreshes(self, mock_search):
+        mock_search.return_value = FakeSearchResult([
+            fake_price(1500, 'month', 'price_ind_m', plan='regular'),
+        ])
+        with override_settings(PRICING_CACHE_STALE_TTL=60):
+            PricingCache(_load_shared).get()
+
+        cache.add(SHARED_LOCK_KEY, 'other-worker', 30)
+        tiers = PricingCache(_load_shared).get().tiers
+
+        mock_search.assert_called_once()
+        self.assertEqual(tiers[1].price_id_monthly, 'price_ind_m')
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_version_only_moves_when_prices_change(self, mock_search):
+        mock_search.return_value = FakeSearchResult([
+            fake_price(1500, 'month', 'price_ind_m', plan='regular'),
+        ])
+        first = get_pricing_snapshot()
+
+        with patch('landing.pricing.time.time', return_value=first.last_modified + 60):
+            refresh_pricing()
+            same = get_pricing_snapshot()
+            mock_search.return_value = FakeSearchResult([
+                fake_price(1900, 'month', 'price_ind_m', plan='regular'),
+            ])
+            refresh_pricing()
+            changed = get_pricing_snapshot()
+
+        self.assertEqual(same.fingerprint, first.fingerprint)
+        self.assertEqual(same.last_modified, first.last_modified)
+        self.assertNotEqual(changed.fingerprint, first.fingerprint)
+        self.assertEqual(changed.last_modified, first.last_modified + 60)
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_cold_worker_fetches_itself_when_lock_holder_never_publishes(self, mock_search):
+        mock_search.return_value = FakeSearchResult([
+            fake_price(1500, 'month', 'price_ind_m', plan='regular'),
+        ])
+        cache.add(SHARED_LOCK_KEY, 'other-worker', 30)
+
+        with self.assertLogs('landing.pricing', level='WARNING'):
+            tiers = PricingCache(_load_shared).get().tiers
+
+        mock_search.assert_called_once()
+        self.assertEqual(tiers[1].price_id_monthly, 'price_ind_m')
+
+
+@override_settings(BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake')
+class PricingRefresherTests(TestCase):
+    def setUp(self):
+        reset_pricing_state()
+        self.cache = PricingCache(_load_shared)
+        self.refresher = PricingRefresher(self.cache)
+        self.addCleanup(self.refresher.stop)
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_refresh_once_warms_cache_and_records_success(self, mock_search):
+        mock_search.return_value = FakeSearchResult([
+            fake_price(1500, 'month', 'price_ind_m', plan='regular'),
+        ])
+
+        self.assertTrue(self.refresher.refresh_once())
+
+        self.assertEqual(self.cache.get().tiers[1].price_id_monthly, 'price_ind_m')
+        status = self.refresher.status()
+        self.assertIsNotNone(status['last_success'])
+        self.assertIsNone(status['last_failure'])
+        self.assertEqual(status['cache']['hits'], 1)
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_requests_never_fetch_while_refresher_runs(self, mock_search):
+        mock_search.side_effect = Exception('stripe is down')
+        with self.assertLogs('landing.pricing', level='ERROR'):
+            self.assertFalse(self.refresher.refresh_once())
+        self.refresher.start(interval=3600)
+
+        self.assertIsNone(self.cache.get())
+        self.assertEqual(mock_search.call_count, 1)
+        status = self.refresher.status()
+        self.assertTrue(status['running'])
+        self.assertEqual(status['consecutive_failures'], 1)
+
+
+@override_settings(
+    BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake',
+    PRICING_CACHE_TTL=0, PRICING_SHARED_CACHE_TTL=0, PRICING_CACHE_STALE_TTL=0,
+    PRICING_BREAKER_FAILURE_THRESHOLD=2, PRICING_BREAKER_RESET_TIMEOUT=60,
+)
+class StripeCircuitBreakerTests(TestCase):
+    def setUp(self):
+        reset_pricing_state()
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_open_breaker_serves_last_good_tiers_without_calling_stripe(self, mock_search):
+        mock_search.return_value = FakeSearchResult([
+            fake_price(1900, 'month', 'price_ind_m', plan='regular'),
+        ])
+        get_pricing_tiers()
+
+        mock_search.side_effect = Exception('stripe is slow')
+        with self.assertLogs('landing.pricing', level='WARNING') as logs:
+            get_pricing_tiers()
+            get_pricing_tiers()
+        self.assertTrue(any('closed -> open' in message for message in logs.output))
+
+        tiers = get_pricing_tiers()
+
+        self.assertEqual(mock_search.call_count, 3)
+        self.assertEqual(tiers[1].price_monthly, 19)
+        stats = stripe_breaker.stats()
+        self.assertEqual(stats['state'], CircuitBreaker.OPEN)
+        self.assertEqual(stats['rejected'], 1)
+
+    @patch('landing.pricing.stripe.Price.search')
+    def test_half_open_probe_closes_breaker_on_success(self, mock_search):
+        mock_search.side_effect = Exception('stripe is slow')
+        with self.assertLogs('landing.pricing', level='ERROR'):
+            get_pricing_tiers()
+            get_pricing_tiers()
+        self.assertEqual(get_pricing_tiers()[1].price_monthly, 15)  # fallback, no call
+        self.assertEqual(mock_search.call_count, 2)
+
+        mock_search.side_effect = None
+        mock_search.return_value = FakeSearchResult([
+            fake_price(1900, 'month', 'price_ind_m', plan='regular'),
+        ])
+        with override_settings(PRICING_BREAKER_RESET_TIMEOUT=0):
+            tiers = get_pricing_tiers()
+
+        self.assertEqual(tiers[1].price_monthly, 19)
+        stats = stripe_breaker.stats()
+        self.assertEqual(stats['state'], CircuitBreaker.CLOSED)
+        self.assertEqual(stats['transitions'], {'open': 1, 'half_open': 1, 'closed': 1})
+
+    @override_settings(PRICING_STRIPE_DEADLINE=0)
+    @patch('landing.pricing.stripe.Price.search')
+    def test_fetch_stops_paginating_past_deadline(self, mock_search):
+        mock_search.side_effect = [
+            FakeSearchResult([fake_price(1900, 'month', 'price_ind_m', plan='regular')], next_page='page_2'),
+            FakeSearchResult([]),
+        ]
+
+        with self.assertLogs('landing.pricing', level='ERROR') as logs:
+            tiers = get_pricing_tiers()
+
+        mock_search.assert_called_once()
+        self.assertIsNone(tiers[1].price_id_monthly)
+        self.assertTrue(any('PRICING_STRIPE_DEADLINE' in message for message in logs.output))
+
+
+
+@override_settings(BILLING_ENABLED=True, STRIPE_API_KEY='sk_test_fake')
+class StripeStandinTests(TestCase):
+    """End to end through the real Stripe SDK, against the local stand-in."""
+
+    def setUp(self):
+        reset_pricing_state()
+
+    def serve(self, prices, **kwargs):
+        standin = StripeStandin(prices, **kwargs)
+        self.addCleanup(standin.stop)
+        self.enterContext(override_settings(STRIPE_API_BASE=standin.start()))
+        return standin
+
+    def test_recorded_catalog_is_paged_through_the_sdk(self):
+        standin = self.serve(synthetic_prices(250) + load_catalog())
+
+        tiers = get_pricing_tiers()
+
+        self.assertEqual(standin.requests, 3)
+        self.assertEqual(tiers[1].price_id_monthly, 'price_1PcHy0Lk3bN8vQ4dH7nS1aLw')
+        self.assertEqual(tiers[3].price_monthly, 199)
+        self.assertEqual(tiers[3].price_annually, 165)
+
+    def test_injected_errors_fall_back_and_count_against_the_breaker(self):
+        standin = self.serve(load_catalog(), error_rate=1.0, error_status=503)
+
+        with self.assertLogs('landing.pricing', level='ERROR'):
+            tiers = get_pricing_tiers()
+
+        self.assertEqual(standin.errors, 1)
+        self.assertIsNone(tiers[1].price_id_monthly)
+        self.assertEqual(stripe_breaker.stats()['consecutive_failures'], 1)
+
 class PricingSSRTests(TestCase):
     def test_homepage_renders_all_tiers_and_dedicated_contact_line(self):
         response = self.client.get('/')
@@ -151,3 +633,487 @@ class PricingSSRTests(TestCase):
         # Enterprise Dedicated is sales-assisted only -- no card, just the contact line.
         self.assertIn('Contact us', content)
         self.assertIn('Enterprise Dedicated', content)
+
+    def test_homepage_embeds_the_pricing_api_payload(self):
+        content = self.client.get('/').content.decode()
+        embedded = content.split('<script id="pricing-data" type="application/json">')[1].split('</script>')[0]
+
+        self.assertEqual(json.loads(embedded), self.client.get('/api/pricing/').json())
+        business = next(t for t in json.loads(embedded)['tiers'] if t['id'] == 'business')
+        self.assertEqual((business['price_monthly'], business['price_annually']), (199, 165))
+
+
+@override_settings(LANDING_PAGE_CACHE=True)
+class LandingPageCacheTests(TestCase):
+    def setUp(self):
+        rendered_pages.clear()
+
+    def test_repeat_visits_skip_the_template_engine(self):
+        first = self.client.get('/')
+        second = self.client.get('/')
+
+        self.assertTemplateUsed(first, 'landing/index.html')
+        self.assertTemplateNotUsed(second, 'landing/index.html')
+        self.assertEqual(rendered_pages.stats()['hits'], 1)
+        self.assertContains(second, 'data-tier="business"')
+
+    def test_each_visitor_gets_their_own_csrf_token(self):
+        tokens = []
+        for _ in range(2):
+            response = Client().get('/')
+            content = response.content.decode()
+            self.assertNotIn(CSRF_PLACEHOLDER, content)
+            self.assertIn(settings.CSRF_COOKIE_NAME, response.cookies)
+            tokens.append(content.split('name="csrf-token" content="')[1].split('"')[0])
+
+        self.assertNotEqual(tokens[0], tokens[1])
+
+    def test_pricing_change_renders_a_new_page(self):
+        self.client.get('/')
+        changed = raised_fallback_snapshot()
+
+        with patch('landing.pricing._fallback_snapshot', return_value=changed):
+            response = self.client.get('/')
+
+        self.assertTemplateUsed(response, 'landing/index.html')
+        self.assertContains(response, '$200')
+
+    def test_requests_with_a_session_are_rendered_normally(self):
+        self.client.get('/')
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'abc'
+
+        response = self.client.get('/')
+
+        self.assertTemplateUsed(response, 'landing/index.html')
+
+
+@override_settings(LANDING_PAGE_CACHE=False, LANDING_FRAGMENT_CACHE_TIMEOUT=60)
+class LandingFragmentCacheTests(TestCase):
+    def setUp(self):
+        caches['fragments'].clear()
+
+    def rendered_icons(self):
+        return patch('landing.templatetags.icons.icon_svg', wraps=icon_svg)
+
+    def test_pricing_change_re_renders_only_the_pricing_fragments(self):
+        with self.rendered_icons() as first:
+            self.client.get('/')
+        first.assert_any_call('edit')
+
+        changed = raised_fallback_snapshot()
+        with patch('landing.pricing._fallback_snapshot', return_value=changed), \
+                self.rendered_icons() as icons:
+            second = self.client.get('/')
+
+        # The features section came from the fragment cache...
+        self.assertNotIn(('edit',), [c.args for c in icons.call_args_list])
+        self.assertContains(second, 'Easy Signing')
+        # ...while the grid and banner were rendered with the new prices.
+        self.assertContains(second, '$200')
+        self.assertNotContains(second, '$199')
+
+    def test_fragments_are_not_kept_when_disabled(self):
+        with self.settings(LANDING_FRAGMENT_CACHE_TIMEOUT=0):
+            self.client.get('/')
+            with self.rendered_icons() as icons:
+                self.client.get('/')
+
+        icons.assert_any_call('edit')
+
+
+class TemplateWarmupTests(TestCase):
+    def test_every_landing_template_is_compiled_and_timed(self):
+        names = [name for name, _ in warm_templates()]
+
+        for name in ('base.html', 'landing/index.html', 'components/doc_preview.html',
+                     'components/icons/edit.svg'):
+            self.assertIn(name, names)
+
+    def test_warmed_templates_are_served_from_the_cached_loader(self):
+        for loader in engines['django'].engine.template_loaders:
+            loader.reset()
+        warm_templates()
+
+        with patch('django.template.loaders.filesystem.Loader.get_contents') as get_contents:
+            self.client.get('/')
+
+        get_contents.assert_not_called()
+
+
+class StaticExportTests(TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def test_export_publishes_page_and_pricing_json(self):
+        release = export_site(self.root)
+
+        current = self.root / 'current'
+        self.assertTrue(current.is_symlink())
+        self.assertEqual(current.resolve(), release.resolve())
+        page = (current / 'index.html').read_text()
+        self.assertIn('data-tier="business"', page)
+        self.assertIn('<meta name="csrf-token" content="">', page)
+        self.assertNotIn(CSRF_PLACEHOLDER, page)
+        pricing = json.loads((current / 'api' / 'pricing.json').read_text())
+        self.assertEqual(pricing, self.client.get('/api/pricing/').json())
+
+    def test_only_stale_exports_are_redone(self):
+        first = export_if_stale(self.root)
+        self.assertIsNotNone(first)
+        self.assertIsNone(export_if_stale(self.root))
+
+        changed = raised_fallback_snapshot()
+        with patch('landing.pricing._fallback_snapshot', return_value=changed):
+            second = export_if_stale(self.root)
+
+        self.assertNotEqual(first, second)
+        self.assertIn('$200', (self.root / 'current' / 'index.html').read_text())
+
+    def test_concurrent_exports_leave_a_published_release(self):
+        workers = [threading.Thread(target=export_site, args=(self.root,)) for _ in range(6)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertTrue((self.root / 'current' / 'index.html').exists())
+        self.assertEqual(len(list((self.root / 'releases').iterdir())), 3)
+
+    def test_export_is_rechecked_periodically(self):
+        refresher = ExportRefresher()
+        checked = threading.Event()
+        with patch('landing.static_export.export_if_stale', side_effect=lambda root: checked.set()) as mock_export:
+            refresher.start(self.root, 0.01)
+            self.assertTrue(checked.wait(5))
+            refresher.stop()
+
+        mock_export.assert_called_with(self.root)
+
+    def test_old_releases_are_pruned(self):
+        releases = [export_site(self.root) for _ in range(5)]
+
+        remaining = set((self.root / 'releases').iterdir())
+        self.assertEqual(len(remaining), 3)
+        self.assertIn(releases[-1], remaining)
+
+
+class IconRegistryTests(TestCase):
+    def test_icons_are_inlined_without_template_includes(self):
+        response = self.client.get('/')
+
+        self.assertTemplateNotUsed(response, 'components/icons/edit.svg')
+        self.assertContains(response, load_icons()['edit'], html=False)
+        self.assertContains(response, load_icons()['phone'], html=False)
+
+    def test_unknown_icon_renders_nothing(self):
+        with self.assertLogs('landing.icons', 'WARNING'):
+            self.assertEqual(icon_svg('no-such-icon'), '')
+
+
+class ContentRegistryTests(TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        shutil.copytree(settings.LANDING_CONTENT_DIR, self.dir, dirs_exist_ok=True)
+        override = self.settings(LANDING_CONTENT_DIR=str(self.dir))
+        override.enable()
+        self.addCleanup(override.disable)
+        content.clear()
+        self.addCleanup(content.clear)
+
+    def edit(self, name, data, mtime_step=1):
+        path = self.dir / name
+        mtime = path.stat().st_mtime
+        path.write_text(data if isinstance(data, str) else json.dumps(data))
+        os.utime(path, (mtime + mtime_step, mtime + mtime_step))
+
+    @override_settings(LANDING_PAGE_CACHE=True, LANDING_FRAGMENT_CACHE_TIMEOUT=60)
+    def test_content_is_shared_until_the_file_changes(self):
+        self.client.get('/')
+        features = get_features()
+        self.assertIs(get_features(), features)
+        self.assertIs(_fallback_snapshot(), _fallback_snapshot())
+
+        self.edit('features.json', {'features': [{'title': 'New', 'description': 'Copy', 'icon': 'lock'}]})
+
+        self.assertEqual([f.title for f in get_features()], ['New'])
+        self.assertContains(self.client.get('/'), 'New')
+
+    def test_fallback_pricing_edit_changes_the_snapshot(self):
+        before = _fallback_snapshot()
+        data = json.loads((self.dir / 'fallback_pricing.json').read_text())
+        data['tiers'][1]['price_monthly'] = 16
+
+        self.edit('fallback_pricing.json', data)
+
+        after = _fallback_snapshot()
+        self.assertNotEqual(after.fingerprint, before.fingerprint)
+        self.assertEqual(after.tiers[1].price_monthly, 16)
+        self.assertEqual(after.tiers[2].addons, before.tiers[2].addons)
+
+    def test_invalid_edit_keeps_serving_the_last_good_content(self):
+        features = get_features()
+
+        with self.assertLogs('landing.content_registry', 'ERROR'):
+            self.edit('features.json', '{"features": [')
+            self.assertIs(get_features(), features)
+
+    def test_missing_file_keeps_serving_the_last_good_content(self):
+        features = get_features()
+        (self.dir / 'features.json').unlink()
+
+        with self.assertLogs('landing.content_registry', 'WARNING'):
+            self.assertIs(get_features(), features)
+            self.assertEqual(self.client.get('/').status_code, 200)
+
+    def test_missing_directory_still_has_a_content_version(self):
+        with self.settings(LANDING_CONTENT_DIR=str(self.dir / 'missing')), \
+                self.assertLogs('landing.content_registry', 'WARNING'):
+            self.assertTrue(content_version())
+
+
+class CriticalCSSTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        override = self.settings(CRITICAL_CSS_DIR=self.dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        critical_css._load_built.cache_clear()
+        self.addCleanup(critical_css._load_built.cache_clear)
+
+    def test_only_rules_for_the_fold_are_extracted(self):
+        css = """
+            :root { --x: 1px; }
+            body { margin: 0; }
+            .hero .hero-title:hover { color: red; }
+            .pricing-card, .hero-note { animation: pulse 1s; }
+            #faq { display: none; }
+            @media (max-width: 768px) { .hero { padding: 0; } .pricing { padding: 0; } }
+            @media print { .footer { display: none; } }
+            @keyframes pulse { 50% { opacity: .5; } }
+            @keyframes spin { to { transform: rotate(1turn); } }
+        """
+        html = (
+            '<html><body><header class="header"></header>'
+            '<section class="hero"><h1 class="hero-title"></h1><p class="hero-note"></p></section>'
+            '<section class="pricing"><div class="pricing-card"></div></section></body></html>'
+        )
+
+        extracted = critical_css.extract_critical_css(css, *critical_css.above_the_fold(html))
+
+        self.assertEqual(extracted, (
+            ':root{--x:1px}body{margin:0}.hero .hero-title:hover{color:red}'
+            '.hero-note{animation:pulse 1s}@media (max-width:768px){.hero{padding:0}}'
+            '@keyframes pulse{50%{opacity:.5}}'
+        ))
+
+    def test_built_css_is_inlined_and_main_css_loads_async(self):
+        html = self.client.get('/').content.decode()
+        self.assertIn('<link rel="stylesheet" href="/static/css/main.css">', html)
+
+        file_name, extracted = critical_css.build('landing/index.html', html)
+        self.assertTrue(extracted)
+        self.assertFalse(critical_css.build('landing/index.html', html)[1])
+
+        html = self.client.get('/').content.decode()
+        self.assertIn('<style>:root{', html)
+        self.assertIn('rel="preload" href="/static/css/main.css" as="style"', html)
+
+    def test_a_build_for_another_stylesheet_is_ignored(self):
+        critical_css.build('landing/index.html', self.client.get('/').content.decode())
+
+        with patch('landing.critical_css.stylesheet_hash', return_value='other'), \
+                self.assertLogs('landing.critical_css', 'WARNING'):
+            self.assertEqual(critical_css.critical_css_for('landing/index.html'), '')
+
+
+class ImagePipelineTests(TestCase):
+    LOGO = Path(settings.BASE_DIR) / 'static' / 'images' / 'hubsign_logo.png'
+
+    def test_png_recompression_is_lossless_and_drops_metadata(self):
+        def pixels(png):
+            return zlib.decompress(b''.join(body for kind, body in _png_chunks(png) if kind == b'IDAT'))
+
+        original = self.LOGO.read_bytes()
+        optimized = optimize_png(original)
+
+        self.assertLess(len(optimized), len(original))
+        self.assertEqual(pixels(optimized), pixels(original))
+        self.assertEqual([kind for kind, _ in _png_chunks(optimized)], [b'IHDR', b'IDAT', b'IEND'])
+
+    def test_svg_minification(self):
+        svg = (
+            '<?xml version="1.0"?>\n<!-- logo -->\n<svg xmlns="http://www.w3.org/2000/svg">\n'
+            '  <metadata>x</metadata>\n  <path d="M 5.683594 0 L 66.433594 -0.0001 Z" '
+            'transform="matrix(0.171562, 0, 0, 0.171562, 0, 0)"/>\n</svg>\n'
+        )
+
+        self.assertEqual(minify_svg(svg), (
+            '<svg xmlns="http://www.w3.org/2000/svg"><path d="M 5.684 0 L 66.434 0 Z" '
+            'transform="matrix(0.171562, 0, 0, 0.171562, 0, 0)"/></svg>'
+        ))
+
+    def test_rounding_keeps_compact_path_data_apart(self):
+        def minified_path(d):
+            return minify_svg('<path d="{}"/>'.format(d))
+
+        self.assertEqual(minified_path('M1.0001.5L0.0001.25'), '<path d="M1 .5L0 .25"/>')
+        self.assertEqual(minified_path('M3.9996.5 2.5.5'), '<path d="M4 .5 2.5.5"/>')
+        self.assertEqual(minified_path('M1.5.0001l1-0.0001'), '<path d="M1.5 0l1 0"/>')
+
+    @override_settings(RESPONSIVE_IMAGES={'images/hubsign_logo.png': 64})
+    def test_collectstatic_optimizes_and_records_variants(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        storage = OptimizedStaticFilesStorage(location=location)
+        storage.save('images/hubsign_logo.png', ContentFile(self.LOGO.read_bytes()))
+
+        source = FileSystemStorage(location=settings.STATICFILES_DIRS[0])
+
+        processed = list(storage.post_process({'images/hubsign_logo.png': (source, 'images/hubsign_logo.png')}))
+
+        self.assertIn(('images/hubsign_logo.png', 'images/hubsign_logo.png', True), processed)
+        with storage.open(IMAGE_MANIFEST) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['savings']['images/hubsign_logo.png']['original'], self.LOGO.stat().st_size)
+        entry = manifest['images']['images/hubsign_logo.png']
+        self.assertEqual((entry['width'], entry['height']), (173, 64))
+        for _, variant in entry['png'] + entry['webp']:
+            self.assertTrue(storage.exists(variant), variant)
+
+    def test_collectstatic_leaves_app_images_alone(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        storage = OptimizedStaticFilesStorage(location=location)
+        svg = b'<svg>\n  <path d="M1.0001.5"/>\n</svg>\n'
+        storage.save('admin/img/icon.svg', ContentFile(svg))
+
+        list(storage.post_process({'admin/img/icon.svg': (FileSystemStorage(location=location), 'admin/img/icon.svg')}))
+
+        with storage.open('admin/img/icon.svg') as f:
+            self.assertEqual(f.read(), svg)
+
+    def test_svg_text_whitespace_is_kept(self):
+        svg = '<svg>\n  <text><tspan>Hello</tspan> <tspan>World</tspan></text>\n</svg>'
+
+        self.assertEqual(minify_svg(svg), '<svg><text><tspan>Hello</tspan> <tspan>World</tspan></text></svg>')
+
+    def render_picture(self):
+        return Template(
+            "{% load images %}{% picture 'images/hubsign_logo.png' alt='HubSign' class='footer-logo' %}"
+        ).render(Context())
+
+    def test_picture_emits_srcsets_from_the_manifest(self):
+        manifest = {'images': {'images/hubsign_logo.png': {
+            'width': 173, 'height': 64,
+            'png': [[173, 'images/hubsign_logo.173w.png'], [270, 'images/hubsign_logo.png']],
+            'webp': [[173, 'images/hubsign_logo.173w.webp'], [270, 'images/hubsign_logo.webp']],
+        }}}
+
+        with patch('landing.templatetags.images.image_manifest', return_value=manifest):
+            html = self.render_picture()
+
+        self.assertInHTML(
+            '<picture><source type="image/webp" sizes="173px" srcset="/static/images/hubsign_logo.173w.webp 173w, '
+            '/static/images/hubsign_logo.webp 270w"><img src="/static/images/hubsign_logo.png" '
+            'srcset="/static/images/hubsign_logo.173w.png 173w, /static/images/hubsign_logo.png 270w" '
+            'sizes="173px" width="173" height="64" alt="HubSign" class="footer-logo"></picture>',
+            html,
+        )
+
+    def test_picture_without_variants_is_a_plain_img(self):
+        with patch('landing.templatetags.images.image_manifest', return_value={}):
+            html = self.render_picture()
+
+        self.assertHTMLEqual(html, '<img src="/static/images/hubsign_logo.png" alt="HubSign" class="footer-logo">')
+
+
+class EarlyHintsTests(TestCase):
+    def test_hints_are_sent_as_103_when_the_server_supports_it(self):
+        sent = []
+        response = self.client.get('/', **{'wsgi.early_hints': sent.append})
+
+        self.assertEqual(sent, [[('Link', link) for link in preload_links()]])
+        self.assertNotIn('Link', response)
+
+    def test_hints_fall_back_to_a_link_header(self):
+        response = self.client.get('/')
+
+        self.assertIn('</static/css/main.css>; rel=preload; as=style', response['Link'])
+        self.assertIn('</static/js/main.js>; rel=preload; as=script', response['Link'])
+        self.assertIn('<https://fonts.gstatic.com>; rel=preconnect; crossorigin', response['Link'])
+
+    def test_hinted_urls_are_the_ones_the_page_loads(self):
+        content = self.client.get('/').content.decode()
+
+        for link in preload_links():
+            self.assertIn(link[1:link.index('>')], content)
+
+    def test_logo_hint_points_at_the_webp_it_announces(self):
+        manifest = {'images': {'images/hubsign_logo.png': {
+            'width': 173, 'height': 64,
+            'png': [[173, 'images/hubsign_logo.173w.png'], [270, 'images/hubsign_logo.png']],
+            'webp': [[173, 'images/hubsign_logo.173w.webp'], [270, 'images/hubsign_logo.webp']],
+        }}}
+
+        with patch('landing.middleware.image_manifest', return_value=manifest):
+            link = _logo_link()
+
+        self.assertTrue(link.startswith(
+            '</static/images/hubsign_logo.173w.webp>; rel=preload; as=image; type="image/webp"',
+        ))
+        self.assertIn(
+            'imagesrcset="/static/images/hubsign_logo.173w.webp 173w, /static/images/hubsign_logo.webp 270w"', link,
+        )
+
+    def test_api_responses_get_no_hints(self):
+        self.assertNotIn('Link', self.client.get('/api/pricing/'))
+
+
+@override_settings(LANDING_STREAMING=True, LANDING_PAGE_CACHE=False)
+class LandingStreamingTests(TestCase):
+    def without_csrf_token(self, html):
+        return re.sub(r'name="csrf-token" content="\w+"', '', html)
+
+    def test_streamed_page_matches_the_whole_render(self):
+        streamed = self.client.get('/')
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(streamed['X-Accel-Buffering'], 'no')
+        self.assertIn(settings.CSRF_COOKIE_NAME, streamed.cookies)
+        streamed_html = b''.join(streamed.streaming_content).decode()
+
+        with override_settings(LANDING_STREAMING=False):
+            whole = self.client.get('/')
+
+        self.assertFalse(whole.streaming)
+        self.assertEqual(self.without_csrf_token(streamed_html), self.without_csrf_token(whole.content.decode()))
+
+    def test_head_is_sent_before_pricing_is_resolved(self):
+        with patch('landing.views.get_pricing_snapshot', wraps=get_pricing_snapshot) as mock_snapshot:
+            chunks = iter(self.client.get('/').streaming_content)
+            head = next(chunks).decode()
+
+            self.assertIn('</head>', head)
+            self.assertIn('css/main.css', head)
+            mock_snapshot.assert_not_called()
+
+            rest = b''.join(chunks).decode()
+
+        mock_snapshot.assert_called_once_with(None)
+        self.assertIn('data-tier="business"', rest)
+        self.assertTrue(rest.rstrip().endswith('</html>'))
+
+    def test_currency_parameter_is_ignored_with_a_single_currency(self):
+        response = self.client.get('/?currency=usd')
+
+        self.assertTrue(response.streaming)
+        self.assertNotIn(settings.PRICING_CURRENCY_COOKIE, response.cookies)
+
+    @override_settings(PRICING_MULTI_CURRENCY=True, PRICING_CURRENCIES=['usd', 'eur'])
+    def test_currency_requests_are_rendered_whole(self):
+        response = self.client.get('/?currency=usd')
+
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.cookies[settings.PRICING_CURRENCY_COOKIE].value, 'usd')
@@ -1,64 +1,157 @@
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
 from django.views.generic import TemplateView
 
-from .pricing import get_pricing_tiers
+from .content_registry import content_version, get_features
+from .page_cache import (
+    CSRF_PLACEHOLDER, is_cacheable, page_cache_key, rendered_pages, template_version, with_csrf_token,
+)
+from .pricing import (
+    aget_pricing_snapshot, get_pricing_snapshot, negotiate_currency, pricing_payload, varies_by_currency,
+)
 
+STREAM_SLOT = '__hubsign_stream_slot__'
 
-class IndexView(TemplateView):
-    """Main landing page view."""
+
+class PricingPageMixin:
+    """Async GET for pages that render the pricing ladder. The snapshot is
+    awaited before rendering, so a cold pricing cache waits on Stripe without
+    holding up other requests served by the same process.
+
+    With PRICING_MULTI_CURRENCY on, the currency is negotiated per request
+    (?currency=, then the currency cookie); a currency picked by query
+    parameter is remembered in the cookie so the rest of the site and
+    /api/pricing/ follow it. Otherwise both are ignored.
+
+    With cache_page set, anonymous GETs are served from landing.page_cache:
+    the page is rendered once per pricing snapshot and template/static
+    version, and later hits only swap in the request's CSRF token. Renders
+    that miss it still reuse the pricing fragments ({% cache %} blocks keyed
+    on the snapshot fingerprint and fragment_version, which tracks the
+    templates and landing copy).
+
+    With stream_page set (and LANDING_STREAMING on), the renders the page
+    cache doesn't serve are streamed instead: the head is flushed before the
+    snapshot is even looked up, so the browser fetches assets meanwhile.
+    """
+    currency_cookie_max_age = 365 * 24 * 60 * 60
+    cache_page = False
+    stream_page = False
+
+    async def get(self, request, *args, **kwargs):
+        currency = negotiate_currency(request)
+        if self.should_stream(request):
+            response = self.render_streaming(request, currency, **kwargs)
+        else:
+            response = await self.render_page(request, currency, **kwargs)
+        if varies_by_currency():
+            patch_vary_headers(response, ('Cookie',))
+        return response
+
+    async def render_page(self, request, currency, **kwargs):
+        pricing = await aget_pricing_snapshot(currency)
+        if self.cache_page and is_cacheable(request):
+            response = self.render_cached(request, pricing, **kwargs)
+        else:
+            response = self.render_pricing_page(pricing, **kwargs)
+        if varies_by_currency() and request.GET.get('currency', '').lower() == pricing.currency:
+            response.set_cookie(
+                settings.PRICING_CURRENCY_COOKIE, pricing.currency,
+                max_age=self.currency_cookie_max_age, samesite='Lax',
+            )
+        return response
+
+    def pricing_context(self, pricing, **kwargs):
+        return self.get_context_data(
+            pricing=pricing, pricing_tiers=pricing.tiers,
+            fragment_cache_timeout=settings.LANDING_FRAGMENT_CACHE_TIMEOUT,
+            fragment_version='{}-{}'.format(template_version(), content_version()),
+            **kwargs,
+        )
+
+    def render_pricing_page(self, pricing, **kwargs):
+        return self.render_to_response(self.pricing_context(pricing, **kwargs))
+
+    def render_cached(self, request, pricing, **kwargs):
+        key = page_cache_key(self.template_name, pricing)
+        body = rendered_pages.get(key)
+        if body is None:
+            response = self.render_pricing_page(pricing, csrf_token=CSRF_PLACEHOLDER, **kwargs)
+            body = response.render().content
+            rendered_pages.set(key, body)
+        return HttpResponse(with_csrf_token(body, request))
+
+    def should_stream(self, request) -> bool:
+        """Stream what the page cache doesn't serve. With several currencies
+        published, a ?currency= request is rendered whole: whether it sets
+        the currency cookie depends on the snapshot, which isn't known until
+        after the headers have gone."""
+        return (
+            self.stream_page and settings.LANDING_STREAMING
+            and not (varies_by_currency() and 'currency' in request.GET)
+            and not (self.cache_page and is_cacheable(request))
+        )
+
+    def render_streaming(self, request, currency, **kwargs):
+        """The page as a StreamingHttpResponse: everything before the
+        sections -- the <head> with its stylesheet and font links, and the
+        header -- is sent first, then pricing is resolved and each of
+        self.sections is rendered and sent in turn, then the footer."""
+        # Now rather than mid-stream, so CsrfViewMiddleware sets the cookie.
+        csrf_token = get_token(request)
+        response = StreamingHttpResponse(self.stream_chunks(currency, csrf_token, **kwargs))
+        # Otherwise nginx buffers the whole response before relaying it.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def stream_chunks(self, currency, csrf_token, **kwargs):
+        shell = render_to_string(
+            self.template_name, {'stream_slot': STREAM_SLOT, 'csrf_token': csrf_token}, self.request,
+        )
+        head, tail = shell.split(STREAM_SLOT)
+        yield head
+        context = self.pricing_context(get_pricing_snapshot(currency), csrf_token=csrf_token, **kwargs)
+        for section in self.sections:
+            yield render_to_string(section, context, self.request)
+        yield tail
+
+
+class IndexView(PricingPageMixin, TemplateView):
+    """Main landing page view. The page embeds its pricing snapshot (the
+    /api/pricing/ payload, monthly and annual prices) as a json_script block
+    for the billing toggle in main.js.
+
+    index.html renders the sections in order; streamed responses send them
+    one chunk each."""
     template_name = 'landing/index.html'
+    cache_page = True
+    stream_page = True
+    sections = (
+        'landing/sections/hero.html',
+        'landing/sections/features.html',
+        'landing/sections/doc_manager.html',
+        'landing/sections/how_it_works.html',
+        'landing/sections/pricing.html',
+        'landing/sections/compliance.html',
+        'landing/sections/cta.html',
+    )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['pricing_tiers'] = get_pricing_tiers()
-        context['features'] = self.get_features()
+        context['features'] = get_features()
+        context['pricing_payload'] = pricing_payload(context['pricing'])
+        context['sections'] = self.sections
         return context
 
-    def get_features(self):
-        """Return feature list data."""
-        return [
-            {
-                'title': 'Easy Signing',
-                'description': 'Sign documents in seconds with draw, type, or upload.',
-                'icon': 'edit',
-            },
-            {
-                'title': 'Templates',
-                'description': 'Create reusable templates with one-click workflows.',
-                'icon': 'document',
-            },
-            {
-                'title': 'Teams',
-                'description': 'Collaborate and manage permissions securely.',
-                'icon': 'users',
-            },
-            {
-                'title': 'Direct Links',
-                'description': 'Share signing links without account creation.',
-                'icon': 'link',
-            },
-            {
-                'title': 'Secure',
-                'description': '256-bit encryption with complete audit trails.',
-                'icon': 'lock',
-            },
-            {
-                'title': 'Lightning Fast',
-                'description': 'Send and receive signed documents in seconds.',
-                'icon': 'clock',
-            },
-        ]
-
-
-class PricingView(TemplateView):
+
+class PricingView(PricingPageMixin, TemplateView):
     """Pricing page view."""
     template_name = 'landing/pricing.html'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['pricing_tiers'] = get_pricing_tiers()
-        return context
-
 
 class FeaturesView(TemplateView):
     """Features page view."""
@@ -66,5 +159,5 @@ class FeaturesView(TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['features'] = IndexView().get_features()
+        context['features'] = get_features()
         return context
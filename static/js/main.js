@@ -119,7 +119,7 @@ function initHeaderScroll() {
 // PRICING TOGGLE
 // =============================================================================
 
-function applyPricingTiers(tiers, isAnnual) {
+function applyPricingTiers(tiers, isAnnual, symbol) {
     tiers.forEach(tier => {
         const card = document.querySelector('[data-tier="' + tier.id + '"]');
         if (!card) return;
@@ -131,15 +131,15 @@ function applyPricingTiers(tiers, isAnnual) {
         if (!amountEl) return;
         const price = isAnnual ? tier.price_annually : tier.price_monthly;
         if (price === 0) {
-            amountEl.textContent = '$0';
+            amountEl.textContent = symbol + '0';
             if (periodEl) periodEl.textContent = '';
             if (billingEl) billingEl.textContent = '';
             if (saveEl) saveEl.textContent = '';
         } else {
-            amountEl.textContent = '$' + price;
+            amountEl.textContent = symbol + price;
             if (periodEl) periodEl.textContent = '/mo';
             if (isAnnual) {
-                if (billingEl) billingEl.textContent = 'Billed $' + (price * 12) + '/yr';
+                if (billingEl) billingEl.textContent = 'Billed ' + symbol + (price * 12) + '/yr';
                 const savings = tier.price_monthly > 0
                     ? Math.round((1 - tier.price_annually / tier.price_monthly) * 100)
                     : 0;
@@ -153,7 +153,7 @@ function applyPricingTiers(tiers, isAnnual) {
             const addon = tier.addons && tier.addons[i];
             if (!addon) return;
             const addonPrice = isAnnual ? addon.price_annually : addon.price_monthly;
-            el.textContent = '$' + addonPrice + addon.unit_suffix;
+            el.textContent = symbol + addonPrice + addon.unit_suffix;
         });
     });
 }
@@ -163,16 +163,30 @@ function initPricingToggle() {
     if (!toggle) return;
 
     let pricingTiers = null;
+    let currencySymbol = '$';
+
+    const usePricing = data => {
+        if (!data) return;
+        pricingTiers = data.tiers;
+        currencySymbol = data.currency_symbol || currencySymbol;
+        // Apply Stripe prices immediately on load (monthly view is default)
+        applyPricingTiers(pricingTiers, false, currencySymbol);
+    };
 
-    fetch('/api/pricing/')
-        .then(r => r.ok ? r.json() : null)
-        .then(data => {
-            if (!data) return;
-            pricingTiers = data.tiers;
-            // Apply Stripe prices immediately on load (monthly view is default)
-            applyPricingTiers(pricingTiers, false);
-        })
-        .catch(() => {});
+    // The landing page embeds the snapshot it was rendered from (both
+    // intervals), so the toggle never needs the network.
+    const embedded = document.getElementById('pricing-data');
+    if (embedded) {
+        usePricing(JSON.parse(embedded.textContent));
+    } else {
+        // Ask for the same currency the page was rendered in; without
+        // ?currency= the API falls back to the currency cookie, as the page did.
+        const currency = new URLSearchParams(window.location.search).get('currency');
+        fetch('/api/pricing/' + (currency ? '?currency=' + encodeURIComponent(currency) : ''))
+            .then(r => r.ok ? r.json() : null)
+            .then(usePricing)
+            .catch(() => {});
+    }
 
     toggle.addEventListener('click', function() {
         this.classList.toggle('annual');
@@ -184,7 +198,7 @@ function initPricingToggle() {
         });
 
         if (!pricingTiers) return;
-        applyPricingTiers(pricingTiers, isAnnual);
+        applyPricingTiers(pricingTiers, isAnnual, currencySymbol);
     });
 }
 